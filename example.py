@@ -13,6 +13,9 @@ MEMORY EFFICIENCY:
 - This allows storing millions of documents with minimal memory footprint
 """
 
+import io
+import sys
+
 from tf import TextEmbedder, VectorStoreWrapper
 
 
@@ -89,8 +92,8 @@ def main():
         
         print("Results:")
         for i, result in enumerate(results, 1):
-            print(f"  {i}. {result['title']} (score: {result['score']:.4f})")
-            print(f"     URL: {result['url']}")
+            print(f"  {i}. {result.title} (score: {result.score:.4f})")
+            print(f"     URL: {result.url}")
             # Note: No 'content' field - we don't store it!
             print(f"     [Content not stored - memory efficient!]")
     
@@ -122,4 +125,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Block-buffer stdout so the demo's many prints coalesce into a few
+    # large writes instead of one syscall per line
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, line_buffering=False)
+    try:
+        main()
+    finally:
+        sys.stdout.flush()
@@ -10,6 +10,9 @@ Demonstrates:
 - Batch operations with parallel processing
 """
 
+import io
+import sys
+
 from tf import DocumentStore
 
 
@@ -138,4 +141,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Block-buffer stdout so the demo's many prints coalesce into a few
+    # large writes instead of one syscall per line
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, line_buffering=False)
+    try:
+        main()
+    finally:
+        sys.stdout.flush()
@@ -8,6 +8,9 @@ This example shows:
 4. Memory optimization techniques
 """
 
+import io
+import sys
+
 from tf import DocumentStore, SearchResult
 
 
@@ -143,4 +146,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Block-buffer stdout so the demo's many prints coalesce into a few
+    # large writes instead of one syscall per line
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, line_buffering=False)
+    try:
+        main()
+    finally:
+        sys.stdout.flush()
@@ -1,133 +1,1407 @@
+use hnsw_rs::prelude::*;
+use memmap2::Mmap;
+use numpy::{IntoPyArray, PyArray1, PyArrayMethods, PyReadonlyArray1, PyReadonlyArray2};
 use pyo3::prelude::*;
 use pyo3::types::{PyDict, PyList};
-use serde_json::json;
-use std::collections::HashMap;
-use std::path::PathBuf;
+use rayon::prelude::*;
+use std::cmp::{Ordering, Reverse};
+use std::collections::{BinaryHeap, HashMap, HashSet};
+use std::fs::File;
+use std::io::{BufWriter, Write as _};
 use std::sync::{Arc, RwLock};
-use vecstore::{Metadata, Query, VecStore};
 
-/// Vector store that manages embeddings and metadata using VecStore
-/// 
+/// HNSW graph parameters (see Malkov & Yashunin).
+/// M=16 / ef_construction=200 is the standard quality/speed trade-off.
+const HNSW_MAX_NB_CONNECTION: usize = 16;
+const HNSW_EF_CONSTRUCTION: usize = 200;
+const HNSW_MAX_LAYER: usize = 16;
+const HNSW_CAPACITY_HINT: usize = 10_000;
+const DEFAULT_EF_SEARCH: usize = 50;
+
+/// Per-thread block size for parallel flat scans, sized to fit in L2.
+const SCAN_CHUNK_BYTES: usize = 256 * 1024;
+
+/// Default number of probed inverted lists per IVF-PQ query.
+const DEFAULT_NPROBE: usize = 8;
+/// Lloyd iterations for both coarse and PQ codebook K-means.
+const KMEANS_ITERS: usize = 10;
+
+/// On-disk store format: magic + version tag.
+const STORE_MAGIC: &[u8; 8] = b"TFVEC001";
+/// Header size; also the file offset of the vector block. 64 bytes keeps
+/// the f32 rows cache-line-aligned (mmap itself is page-aligned).
+const STORE_HEADER_LEN: usize = 64;
+
+/// Document metadata stored structure-of-arrays: one Vec per field,
+/// indexed by the internal document index. Content text is never stored -
+/// it's discarded after vectorization.
+///
+/// Assembling a result touches four parallel arrays by direct index - no
+/// per-result hash lookup and no pointer chase through per-document record
+/// structs. The one string-keyed hash lookup per document happens at the
+/// id_to_idx map, once.
+struct MetaColumns {
+    ids: Vec<String>,
+    titles: Vec<String>,
+    urls: Vec<String>,
+    summaries: Vec<String>,
+}
+
+impl MetaColumns {
+    fn new() -> Self {
+        MetaColumns {
+            ids: Vec::new(),
+            titles: Vec::new(),
+            urls: Vec::new(),
+            summaries: Vec::new(),
+        }
+    }
+
+    /// Append one document's metadata, returning its internal index.
+    fn push(&mut self, id: String, title: String, url: String, summary: String) -> usize {
+        let idx = self.ids.len();
+        self.ids.push(id);
+        self.titles.push(title);
+        self.urls.push(url);
+        self.summaries.push(summary);
+        idx
+    }
+
+}
+
+// The three hot kernels below carry #[multiversion]: the macro compiles one
+// clone of the function body per listed target (plus a baseline), detects
+// CPU features once at first call, and caches the chosen clone in a function
+// pointer. A published wheel built without target-cpu=native therefore still
+// runs 16-wide AVX-512 FMA where the CPU has it, 8-wide AVX2 elsewhere, and
+// NEON on aarch64 - without any unsafe intrinsics in this crate.
+
+/// Squared L2 distance between two equal-length slices.
+#[multiversion::multiversion(targets(
+    "x86_64+avx512f",
+    "x86_64+avx2+fma",
+    "x86_64+sse4.1",
+    "aarch64+neon"
+))]
+fn l2_sq(a: &[f32], b: &[f32]) -> f32 {
+    a.iter().zip(b).map(|(x, y)| (x - y) * (x - y)).sum()
+}
+
+/// Dot product with four independent 8-wide accumulator blocks.
+///
+/// The unroll gives LLVM straight-line multiply-add chains with no
+/// loop-carried dependency between blocks, which it maps onto whatever
+/// SIMD registers the dispatched clone targets (see the multiversion note
+/// above) while keeping the crate free of unsafe intrinsics. Four
+/// accumulators are enough to hide the ~4-cycle FMA latency.
+#[multiversion::multiversion(targets(
+    "x86_64+avx512f",
+    "x86_64+avx2+fma",
+    "x86_64+sse4.1",
+    "aarch64+neon"
+))]
+fn dot_f32(a: &[f32], b: &[f32]) -> f32 {
+    const LANES: usize = 8;
+    const UNROLL: usize = 4;
+    const STEP: usize = LANES * UNROLL;
+
+    let main = a.len() - a.len() % STEP;
+    let mut acc = [[0.0f32; LANES]; UNROLL];
+    for (ca, cb) in a[..main]
+        .chunks_exact(STEP)
+        .zip(b[..main].chunks_exact(STEP))
+    {
+        for u in 0..UNROLL {
+            for l in 0..LANES {
+                let i = u * LANES + l;
+                acc[u][l] += ca[i] * cb[i];
+            }
+        }
+    }
+
+    // Fold the accumulator blocks, then the lanes
+    let mut lanes = [0.0f32; LANES];
+    for block in &acc {
+        for l in 0..LANES {
+            lanes[l] += block[l];
+        }
+    }
+    let mut sum: f32 = lanes.iter().sum();
+
+    // Scalar tail for lengths that aren't a multiple of STEP
+    for i in main..a.len() {
+        sum += a[i] * b[i];
+    }
+    sum
+}
+
+/// A (doc index, score) candidate ordered by score for heap selection.
+#[derive(PartialEq)]
+struct Hit {
+    score: f32,
+    idx: usize,
+}
+
+impl Eq for Hit {}
+
+impl Ord for Hit {
+    fn cmp(&self, other: &Self) -> Ordering {
+        self.score
+            .total_cmp(&other.score)
+            .then_with(|| self.idx.cmp(&other.idx))
+    }
+}
+
+impl PartialOrd for Hit {
+    fn partial_cmp(&self, other: &Self) -> Option<Ordering> {
+        Some(self.cmp(other))
+    }
+}
+
+/// Bounded min-heap keeping the k highest-scoring candidates seen so far.
+///
+/// Selecting top-k this way is O(N log k) instead of the O(N log N) of
+/// sorting every score; for small k the heap top rarely changes, so most
+/// candidates cost a single comparison.
+struct TopK {
+    k: usize,
+    heap: BinaryHeap<Reverse<Hit>>,
+}
+
+impl TopK {
+    fn new(k: usize) -> Self {
+        TopK {
+            k,
+            heap: BinaryHeap::with_capacity(k + 1),
+        }
+    }
+
+    fn push(&mut self, idx: usize, score: f32) {
+        if self.heap.len() < self.k {
+            self.heap.push(Reverse(Hit { score, idx }));
+        } else if let Some(Reverse(worst)) = self.heap.peek() {
+            if score > worst.score {
+                self.heap.pop();
+                self.heap.push(Reverse(Hit { score, idx }));
+            }
+        }
+    }
+
+    /// Fold another TopK's survivors into this one (per-chunk heap merge).
+    fn merge(&mut self, other: TopK) {
+        for Reverse(hit) in other.heap {
+            self.push(hit.idx, hit.score);
+        }
+    }
+
+    /// Drain into (doc index, score) pairs, best first.
+    fn into_sorted(self) -> Vec<(usize, f32)> {
+        let mut hits: Vec<(usize, f32)> = self
+            .heap
+            .into_iter()
+            .map(|Reverse(hit)| (hit.idx, hit.score))
+            .collect();
+        hits.sort_by(|a, b| b.1.total_cmp(&a.1));
+        hits
+    }
+}
+
+/// L2-normalize a vector in place. Zero vectors are left untouched.
+///
+/// Vectors are immutable once stored, so normalizing a single time at
+/// insert (and the query once per search) reduces the per-candidate score
+/// to a pure dot product - no norms or divides in the inner loop.
+fn normalize_in_place(vector: &mut [f32]) {
+    let norm = dot_f32(vector, vector).sqrt();
+    if norm > 0.0 {
+        for x in vector.iter_mut() {
+            *x /= norm;
+        }
+    }
+}
+
+/// One cache line of vector data: 16 f32 lanes, 64-byte aligned.
+///
+/// Storing the flat arena as `Vec<AlignedBlock>` guarantees the buffer
+/// (and, with dims padded to a block multiple, every row) starts on a
+/// 64-byte boundary, so the vector loads the autovectorizer emits for the
+/// dot kernel never straddle cache lines.
+#[repr(C, align(64))]
+#[derive(Clone, Copy, bytemuck::Pod, bytemuck::Zeroable)]
+struct AlignedBlock([f32; BLOCK_FLOATS]);
+
+/// Floats per aligned block (64 bytes).
+const BLOCK_FLOATS: usize = 16;
+
+/// Row stride for a given logical dimension: padded up to a whole number
+/// of aligned blocks. 768- and 1024-dim embeddings need no padding.
+fn padded_dim(dim: usize) -> usize {
+    dim.div_ceil(BLOCK_FLOATS) * BLOCK_FLOATS
+}
+
+/// Exact-scan index over one contiguous row-major vector buffer.
+///
+/// Vectors are stored structure-of-arrays style: a single flat arena
+/// holding all rows back to back, with the per-row bookkeeping in parallel
+/// Vecs. The scan loop then issues unit-stride loads that the hardware
+/// prefetcher and the autovectorizer handle well, instead of chasing one
+/// heap allocation per document. Rows are zero-padded to a 64-byte
+/// multiple so every row begins on a cache-line boundary.
+struct FlatIndex {
+    dim: usize,
+    /// Row stride in floats: dim rounded up to a block multiple.
+    padded: usize,
+    /// 64-byte-aligned arena; row r starts at block r * padded/BLOCK_FLOATS.
+    data: Vec<AlignedBlock>,
+    /// Document index (into Inner.meta columns) of each row.
+    doc_idx: Vec<usize>,
+    /// Reverse map for O(1) removal: document index -> row.
+    row_of_doc: HashMap<usize, usize>,
+}
+
+impl FlatIndex {
+    fn new(dim: usize) -> Self {
+        FlatIndex {
+            dim,
+            padded: padded_dim(dim),
+            data: Vec::new(),
+            doc_idx: Vec::new(),
+            row_of_doc: HashMap::new(),
+        }
+    }
+
+    /// The arena viewed as one flat f32 slice with stride `padded`.
+    fn as_f32(&self) -> &[f32] {
+        bytemuck::cast_slice(&self.data)
+    }
+
+    /// Blocks per row.
+    fn blocks_per_row(&self) -> usize {
+        self.padded / BLOCK_FLOATS
+    }
+
+    /// The logical (unpadded) vector stored in row `row`.
+    fn row(&self, row: usize) -> &[f32] {
+        &self.as_f32()[row * self.padded..row * self.padded + self.dim]
+    }
+
+    fn insert(&mut self, idx: usize, vector: &[f32]) {
+        let row = self.doc_idx.len();
+        for chunk in vector.chunks(BLOCK_FLOATS) {
+            let mut block = [0.0f32; BLOCK_FLOATS];
+            block[..chunk.len()].copy_from_slice(chunk);
+            self.data.push(AlignedBlock(block));
+        }
+        self.doc_idx.push(idx);
+        self.row_of_doc.insert(idx, row);
+    }
+
+    /// Physically remove a document's row by moving the last row into its
+    /// slot (swap_remove on all columns) - no tombstones needed.
+    fn remove(&mut self, idx: usize) {
+        let Some(row) = self.row_of_doc.remove(&idx) else {
+            return;
+        };
+        let last = self.doc_idx.len() - 1;
+        if row != last {
+            let bpr = self.blocks_per_row();
+            self.data
+                .copy_within(last * bpr..(last + 1) * bpr, row * bpr);
+            let moved = self.doc_idx[last];
+            self.doc_idx[row] = moved;
+            self.row_of_doc.insert(moved, row);
+        }
+        self.doc_idx.pop();
+        self.data.truncate(last * self.blocks_per_row());
+    }
+
+    /// Exact scan. Both the stored rows and the query are unit-norm, so
+    /// cosine similarity is a single dot product per candidate.
+    ///
+    /// The scan is split into L2-sized row blocks processed in parallel by
+    /// Rayon; each block keeps a local top-k which are merged at the end.
+    /// Returns (doc index, score) in descending order.
+    fn search(&self, vector: &[f32], k: usize) -> Vec<(usize, f32)> {
+        let rows_per_chunk = (SCAN_CHUNK_BYTES / (self.padded * 4)).max(1);
+        self.as_f32()
+            .par_chunks(rows_per_chunk * self.padded)
+            .zip(self.doc_idx.par_chunks(rows_per_chunk))
+            .map(|(block, idxs)| {
+                let mut local = TopK::new(k);
+                for (row, &idx) in block.chunks_exact(self.padded).zip(idxs) {
+                    local.push(idx, dot_f32(vector, &row[..self.dim]));
+                }
+                local
+            })
+            .reduce(
+                || TopK::new(k),
+                |mut merged, local| {
+                    merged.merge(local);
+                    merged
+                },
+            )
+            .into_sorted()
+    }
+}
+
+/// Plain Lloyd's K-means over `n` points of dimension `dim` stored row-major.
+///
+/// Returns `k * dim` centroids. When there are fewer points than requested
+/// centroids, the points themselves are used (cycled) so every centroid is
+/// initialized.
+fn kmeans(data: &[f32], n: usize, dim: usize, k: usize, iters: usize) -> Vec<f32> {
+    let mut centroids = vec![0.0f32; k * dim];
+    // Spread initial centroids evenly over the (insertion-ordered) points
+    for c in 0..k {
+        let src = (c * n.max(1) / k.max(1)).min(n.saturating_sub(1));
+        centroids[c * dim..(c + 1) * dim].copy_from_slice(&data[src * dim..(src + 1) * dim]);
+    }
+    if n <= k {
+        return centroids;
+    }
+
+    let mut assignment = vec![0usize; n];
+    for _ in 0..iters {
+        // Assignment step
+        for i in 0..n {
+            let point = &data[i * dim..(i + 1) * dim];
+            let mut best = 0usize;
+            let mut best_dist = f32::INFINITY;
+            for c in 0..k {
+                let dist = l2_sq(point, &centroids[c * dim..(c + 1) * dim]);
+                if dist < best_dist {
+                    best_dist = dist;
+                    best = c;
+                }
+            }
+            assignment[i] = best;
+        }
+
+        // Update step
+        let mut sums = vec![0.0f32; k * dim];
+        let mut counts = vec![0usize; k];
+        for i in 0..n {
+            let c = assignment[i];
+            counts[c] += 1;
+            for d in 0..dim {
+                sums[c * dim + d] += data[i * dim + d];
+            }
+        }
+        for c in 0..k {
+            if counts[c] > 0 {
+                for d in 0..dim {
+                    centroids[c * dim + d] = sums[c * dim + d] / counts[c] as f32;
+                }
+            }
+        }
+    }
+
+    centroids
+}
+
+/// Quantize a vector to int8 with a per-vector scale: code = round(v/scale),
+/// scale = max|v|/127. Reconstruction is code * scale.
+fn quantize_i8(vector: &[f32]) -> (Vec<i8>, f32) {
+    let max_abs = vector.iter().fold(0.0f32, |m, &x| m.max(x.abs()));
+    if max_abs == 0.0 {
+        return (vec![0i8; vector.len()], 0.0);
+    }
+    let scale = max_abs / 127.0;
+    let codes = vector
+        .iter()
+        .map(|&x| (x / scale).round().clamp(-127.0, 127.0) as i8)
+        .collect();
+    (codes, scale)
+}
+
+/// Integer dot product over int8 codes, accumulated in i32.
+/// Same unroll shape as dot_f32 so the autovectorizer can use packed
+/// widening multiply-adds (VNNI / NEON DotProd where available).
+#[multiversion::multiversion(targets(
+    "x86_64+avx512f+avx512bw",
+    "x86_64+avx2",
+    "x86_64+sse4.1",
+    "aarch64+neon"
+))]
+fn dot_i8(a: &[i8], b: &[i8]) -> i32 {
+    const LANES: usize = 16;
+    let main = a.len() - a.len() % LANES;
+    let mut lanes = [0i32; LANES];
+    for (ca, cb) in a[..main]
+        .chunks_exact(LANES)
+        .zip(b[..main].chunks_exact(LANES))
+    {
+        for l in 0..LANES {
+            lanes[l] += ca[l] as i32 * cb[l] as i32;
+        }
+    }
+    let mut sum: i32 = lanes.iter().sum();
+    for i in main..a.len() {
+        sum += a[i] as i32 * b[i] as i32;
+    }
+    sum
+}
+
+/// Exact-scan index over int8-quantized vectors: ~4x less memory and
+/// bandwidth per row than the f32 flat index.
+///
+/// Vectors are L2-normalized before quantization, so the dequantized
+/// integer dot product approximates cosine similarity directly.
+struct FlatI8Index {
+    dim: usize,
+    /// Row-major int8 codes; row r lives at data[r*dim..(r+1)*dim].
+    data: Vec<i8>,
+    /// Per-row dequantization scale.
+    scales: Vec<f32>,
+    /// Document index (into Inner.meta columns) of each row.
+    doc_idx: Vec<usize>,
+    /// Reverse map for O(1) removal: document index -> row.
+    row_of_doc: HashMap<usize, usize>,
+}
+
+impl FlatI8Index {
+    fn new(dim: usize) -> Self {
+        FlatI8Index {
+            dim,
+            data: Vec::new(),
+            scales: Vec::new(),
+            doc_idx: Vec::new(),
+            row_of_doc: HashMap::new(),
+        }
+    }
+
+    fn insert(&mut self, idx: usize, vector: &[f32]) {
+        // Input is already unit-norm (normalized at store level)
+        let (codes, scale) = quantize_i8(vector);
+
+        let row = self.doc_idx.len();
+        self.data.extend_from_slice(&codes);
+        self.scales.push(scale);
+        self.doc_idx.push(idx);
+        self.row_of_doc.insert(idx, row);
+    }
+
+    /// Swap-remove across all columns, as in FlatIndex.
+    fn remove(&mut self, idx: usize) {
+        let Some(row) = self.row_of_doc.remove(&idx) else {
+            return;
+        };
+        let last = self.doc_idx.len() - 1;
+        if row != last {
+            let dim = self.dim;
+            self.data
+                .copy_within(last * dim..(last + 1) * dim, row * dim);
+            self.scales[row] = self.scales[last];
+            let moved = self.doc_idx[last];
+            self.doc_idx[row] = moved;
+            self.row_of_doc.insert(moved, row);
+        }
+        self.doc_idx.pop();
+        self.scales.pop();
+        self.data.truncate(last * self.dim);
+    }
+
+    /// Quantized cosine scan: score = int_dot * query_scale * row_scale.
+    /// The query is already unit-norm (normalized at store level).
+    /// Parallelized over L2-sized row blocks like FlatIndex::search.
+    fn search(&self, vector: &[f32], k: usize) -> Vec<(usize, f32)> {
+        let (query, q_scale) = quantize_i8(vector);
+
+        let rows_per_chunk = (SCAN_CHUNK_BYTES / self.dim).max(1);
+        self.data
+            .par_chunks(rows_per_chunk * self.dim)
+            .zip(self.doc_idx.par_chunks(rows_per_chunk))
+            .zip(self.scales.par_chunks(rows_per_chunk))
+            .map(|((block, idxs), scales)| {
+                let mut local = TopK::new(k);
+                for (row, (&idx, &scale)) in
+                    block.chunks_exact(self.dim).zip(idxs.iter().zip(scales))
+                {
+                    local.push(idx, dot_i8(&query, row) as f32 * q_scale * scale);
+                }
+                local
+            })
+            .reduce(
+                || TopK::new(k),
+                |mut merged, local| {
+                    merged.merge(local);
+                    merged
+                },
+            )
+            .into_sorted()
+    }
+}
+
+/// Read-only exact-scan index over a memory-mapped vector block.
+///
+/// The f32 rows are read straight out of the OS page cache - no heap copy
+/// of the vector data is ever made, cold start is one mmap call, and
+/// multiple processes opening the same file share the physical pages.
+/// Row r is also internal document index r: save() writes rows compacted
+/// in row order.
+struct MmapIndex {
+    dim: usize,
+    n: usize,
+    /// Whole store file; the vector block starts at STORE_HEADER_LEN,
+    /// which is 64-byte aligned because mmap is page-aligned.
+    mmap: Mmap,
+}
+
+impl MmapIndex {
+    /// The vector block viewed as one flat row-major f32 slice.
+    fn rows(&self) -> &[f32] {
+        let bytes = &self.mmap[STORE_HEADER_LEN..STORE_HEADER_LEN + self.n * self.dim * 4];
+        bytemuck::cast_slice(bytes)
+    }
+
+    /// Same parallel scan as FlatIndex::search, reading rows directly from
+    /// the mapped file.
+    fn search(&self, vector: &[f32], k: usize) -> Vec<(usize, f32)> {
+        let rows_per_chunk = (SCAN_CHUNK_BYTES / (self.dim * 4)).max(1);
+        self.rows()
+            .par_chunks(rows_per_chunk * self.dim)
+            .enumerate()
+            .map(|(chunk_no, block)| {
+                let mut local = TopK::new(k);
+                let base = chunk_no * rows_per_chunk;
+                for (i, row) in block.chunks_exact(self.dim).enumerate() {
+                    local.push(base + i, dot_f32(vector, row));
+                }
+                local
+            })
+            .reduce(
+                || TopK::new(k),
+                |mut merged, local| {
+                    merged.merge(local);
+                    merged
+                },
+            )
+            .into_sorted()
+    }
+}
+
+/// Append a u32-length-prefixed UTF-8 string to the metadata blob.
+fn write_str(out: &mut Vec<u8>, s: &str) {
+    out.extend_from_slice(&(s.len() as u32).to_le_bytes());
+    out.extend_from_slice(s.as_bytes());
+}
+
+/// Read back one length-prefixed string, advancing `pos`.
+fn read_str(bytes: &[u8], pos: &mut usize) -> PyResult<String> {
+    let err = || {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>("Corrupt store file: truncated metadata")
+    };
+    if *pos + 4 > bytes.len() {
+        return Err(err());
+    }
+    let len = u32::from_le_bytes(bytes[*pos..*pos + 4].try_into().unwrap()) as usize;
+    *pos += 4;
+    if *pos + len > bytes.len() {
+        return Err(err());
+    }
+    let s = std::str::from_utf8(&bytes[*pos..*pos + len])
+        .map_err(|_| err())?
+        .to_string();
+    *pos += len;
+    Ok(s)
+}
+
+/// IVF-PQ index: coarse K-means quantizer + product-quantized residuals.
+///
+/// Each stored vector is reduced to `m` uint8 codes (one per subvector), an
+/// 8-32x compression over raw float32, and search aggregates distances via a
+/// per-query lookup table instead of full dot products. The index buffers raw
+/// vectors until enough have arrived to train the codebooks; before training,
+/// search falls back to an exact scan over the buffer.
+struct IvfPq {
+    nlist: usize,
+    nprobe: usize,
+    /// Number of subvectors (PQ segments) per vector.
+    m: usize,
+    /// Dimension of each subvector (dim / m).
+    dsub: usize,
+    /// Codebook entries per segment (2^nbits).
+    ksub: usize,
+    /// Inserts buffered until K-means training kicks in.
+    train_threshold: usize,
+    trained: bool,
+    /// Vectors awaiting training: flat row-major buffer + doc indices.
+    pending: FlatIndex,
+    /// Coarse centroids, `nlist * dim` row-major.
+    centroids: Vec<f32>,
+    /// Residual codebooks, `m * ksub * dsub` row-major.
+    codebooks: Vec<f32>,
+    /// Inverted lists of (doc index, PQ code) per coarse centroid.
+    lists: Vec<Vec<(usize, Vec<u8>)>>,
+    /// Secondary HNSW graph over the coarse centroids, built at train time.
+    /// Finds the top-nprobe lists in O(log nlist) instead of scanning all
+    /// nlist centroids, which otherwise dominates search latency.
+    centroid_hnsw: Option<Hnsw<'static, f32, DistL2>>,
+}
+
+impl IvfPq {
+    fn new(dim: usize, nlist: usize, m: usize, nbits: usize) -> Self {
+        IvfPq {
+            nlist,
+            nprobe: DEFAULT_NPROBE.min(nlist),
+            m,
+            dsub: dim / m,
+            ksub: 1 << nbits,
+            // FAISS heuristic: ~39 training points per centroid
+            train_threshold: (nlist * 39).max(256),
+            trained: false,
+            pending: FlatIndex::new(dim),
+            centroids: Vec::new(),
+            codebooks: Vec::new(),
+            lists: vec![Vec::new(); nlist],
+            centroid_hnsw: None,
+        }
+    }
+
+    /// Indices of the `n` coarse centroids nearest to `vector`.
+    ///
+    /// Goes through the centroid HNSW graph when available (post-training);
+    /// falls back to a linear scan otherwise.
+    fn nearest_centroids(&self, vector: &[f32], n: usize) -> Vec<usize> {
+        let n = n.max(1).min(self.nlist);
+        if let Some(hnsw) = &self.centroid_hnsw {
+            let found: Vec<usize> = hnsw
+                .search(vector, n, (n * 4).max(DEFAULT_EF_SEARCH))
+                .into_iter()
+                .map(|neighbour| neighbour.d_id)
+                .collect();
+            if !found.is_empty() {
+                return found;
+            }
+        }
+
+        let dim = vector.len();
+        let mut dists: Vec<(usize, f32)> = (0..self.nlist)
+            .map(|c| (c, l2_sq(vector, &self.centroids[c * dim..(c + 1) * dim])))
+            .collect();
+        dists.sort_by(|a, b| a.1.total_cmp(&b.1));
+        dists.truncate(n);
+        dists.into_iter().map(|(c, _)| c).collect()
+    }
+
+    /// Index of the nearest coarse centroid to `vector`.
+    fn nearest_centroid(&self, vector: &[f32]) -> usize {
+        self.nearest_centroids(vector, 1)[0]
+    }
+
+    /// Encode the residual of `vector` w.r.t. its coarse centroid.
+    fn encode(&self, vector: &[f32], centroid: usize) -> Vec<u8> {
+        let dim = vector.len();
+        let centroid = &self.centroids[centroid * dim..(centroid + 1) * dim];
+        let mut code = Vec::with_capacity(self.m);
+        for seg in 0..self.m {
+            let lo = seg * self.dsub;
+            let residual: Vec<f32> = (lo..lo + self.dsub)
+                .map(|d| vector[d] - centroid[d])
+                .collect();
+            let book =
+                &self.codebooks[seg * self.ksub * self.dsub..(seg + 1) * self.ksub * self.dsub];
+            let mut best = 0usize;
+            let mut best_dist = f32::INFINITY;
+            for entry in 0..self.ksub {
+                let dist = l2_sq(&residual, &book[entry * self.dsub..(entry + 1) * self.dsub]);
+                if dist < best_dist {
+                    best_dist = dist;
+                    best = entry;
+                }
+            }
+            code.push(best as u8);
+        }
+        code
+    }
+
+    /// Insert one vector; trains the index once enough are buffered.
+    fn insert(&mut self, idx: usize, vector: Vec<f32>) {
+        if self.trained {
+            let centroid = self.nearest_centroid(&vector);
+            let code = self.encode(&vector, centroid);
+            self.lists[centroid].push((idx, code));
+        } else {
+            self.pending.insert(idx, &vector);
+            if self.pending.doc_idx.len() >= self.train_threshold {
+                self.train();
+            }
+        }
+    }
+
+    /// Run K-means for the coarse quantizer and the residual codebooks, then
+    /// flush all buffered vectors into the inverted lists.
+    fn train(&mut self) {
+        let n = self.pending.doc_idx.len();
+        let dim = self.dsub * self.m;
+
+        // Compact the (64-byte padded) pending rows into a dense dim-stride
+        // matrix for training - K-means is a one-off cost
+        let mut train_data = Vec::with_capacity(n * dim);
+        for row in 0..n {
+            train_data.extend_from_slice(self.pending.row(row));
+        }
+        self.centroids = kmeans(&train_data, n, dim, self.nlist, KMEANS_ITERS);
+
+        // Index the centroids themselves with HNSW so the coarse quantizer
+        // runs in logarithmic rather than linear time
+        let centroid_hnsw = Hnsw::new(
+            HNSW_MAX_NB_CONNECTION,
+            self.nlist,
+            HNSW_MAX_LAYER,
+            HNSW_EF_CONSTRUCTION,
+            DistL2 {},
+        );
+        for c in 0..self.nlist {
+            centroid_hnsw.insert((&self.centroids[c * dim..(c + 1) * dim], c));
+        }
+        self.centroid_hnsw = Some(centroid_hnsw);
+
+        // Codebooks are trained on residuals, one K-means per segment
+        let mut residuals = vec![0.0f32; n * dim];
+        for i in 0..n {
+            let v = &train_data[i * dim..(i + 1) * dim];
+            let c = self.nearest_centroid(v);
+            let centroid = &self.centroids[c * dim..(c + 1) * dim];
+            for d in 0..dim {
+                residuals[i * dim + d] = v[d] - centroid[d];
+            }
+        }
+        self.codebooks = vec![0.0f32; self.m * self.ksub * self.dsub];
+        let mut seg_data = vec![0.0f32; n * self.dsub];
+        for seg in 0..self.m {
+            for i in 0..n {
+                let lo = i * dim + seg * self.dsub;
+                seg_data[i * self.dsub..(i + 1) * self.dsub]
+                    .copy_from_slice(&residuals[lo..lo + self.dsub]);
+            }
+            let book = kmeans(&seg_data, n, self.dsub, self.ksub, KMEANS_ITERS);
+            self.codebooks[seg * self.ksub * self.dsub..(seg + 1) * self.ksub * self.dsub]
+                .copy_from_slice(&book);
+        }
+
+        self.trained = true;
+        let pending = std::mem::replace(&mut self.pending, FlatIndex::new(dim));
+        for (row, &idx) in pending.doc_idx.iter().enumerate() {
+            self.insert(idx, pending.row(row).to_vec());
+        }
+    }
+
+    /// Approximate search: probe the nearest `nprobe` lists and rank their
+    /// PQ codes via a lookup table. Returns (doc index, distance) ascending.
+    fn search(&self, vector: &[f32], k: usize, nprobe: usize) -> Vec<(usize, f32)> {
+        let dim = vector.len();
+
+        if !self.trained {
+            // Exact scan over the training buffer. TopK keeps the highest
+            // scores, so push negated distances and flip back on the way out.
+            let mut top = TopK::new(k);
+            for (row, &idx) in self.pending.doc_idx.iter().enumerate() {
+                top.push(idx, -l2_sq(vector, self.pending.row(row)));
+            }
+            return top
+                .into_sorted()
+                .into_iter()
+                .map(|(idx, neg_dist)| (idx, -neg_dist))
+                .collect();
+        }
+
+        // (a) find the top-nprobe coarse centroids via the centroid HNSW
+        let probes = self.nearest_centroids(vector, nprobe);
+
+        let mut top = TopK::new(k);
+        for c in probes {
+            // (b) per-list LUT: distance from the query residual to every
+            // codebook entry, m x ksub floats
+            let centroid = &self.centroids[c * dim..(c + 1) * dim];
+            let mut lut = vec![0.0f32; self.m * self.ksub];
+            for seg in 0..self.m {
+                let lo = seg * self.dsub;
+                let residual: Vec<f32> = (lo..lo + self.dsub)
+                    .map(|d| vector[d] - centroid[d])
+                    .collect();
+                let book =
+                    &self.codebooks[seg * self.ksub * self.dsub..(seg + 1) * self.ksub * self.dsub];
+                for entry in 0..self.ksub {
+                    lut[seg * self.ksub + entry] =
+                        l2_sq(&residual, &book[entry * self.dsub..(entry + 1) * self.dsub]);
+                }
+            }
+
+            // (c) aggregate candidate distances by table lookup
+            for (idx, code) in &self.lists[c] {
+                let dist: f32 = code
+                    .iter()
+                    .enumerate()
+                    .map(|(seg, &entry)| lut[seg * self.ksub + entry as usize])
+                    .sum();
+                top.push(*idx, -dist);
+            }
+        }
+
+        top.into_sorted()
+            .into_iter()
+            .map(|(idx, neg_dist)| (idx, -neg_dist))
+            .collect()
+    }
+}
+
+/// The structure backing a store: HNSW graph (default), IVF-PQ, or an
+/// exact flat scan.
+enum Index {
+    Hnsw {
+        hnsw: Hnsw<'static, f32, DistCosine>,
+        ef_search: usize,
+    },
+    IvfPq(IvfPq),
+    Flat(FlatIndex),
+    FlatI8(FlatI8Index),
+    /// Read-only flat scan over a memory-mapped file (see open_mmap).
+    FlatMmap(MmapIndex),
+}
+
+/// Store internals guarded by a single RwLock.
+///
+/// Documents are assigned monotonically increasing internal indices which
+/// double as the DataId handed to the index. Neither backend supports true
+/// deletion, so `rm` tombstones the index (hnswlib-style) and search filters
+/// tombstoned hits out.
+struct Inner {
+    index: Index,
+    meta: MetaColumns,
+    id_to_idx: HashMap<String, usize>,
+    tombstones: HashSet<usize>,
+}
+
+/// Rank candidates for a normalized query against whichever index is live.
+///
+/// Shared by all search entry points. Hits come back best first; graph
+/// indexes over-fetch to compensate for tombstones that the caller filters
+/// out. Scores are cosine similarity for HNSW, negated (approximate)
+/// squared L2 for IVF-PQ, and plain dot products for the flat scans -
+/// higher always means more relevant.
+fn ranked_hits(
+    inner: &Inner,
+    vector: &[f32],
+    k: usize,
+    nprobe: Option<usize>,
+) -> Vec<(usize, f32)> {
+    match &inner.index {
+        Index::Hnsw { hnsw, ef_search } => {
+            let knbn = k + inner.tombstones.len().min(k);
+            let ef = (*ef_search).max(knbn);
+            hnsw.search(vector, knbn, ef)
+                .into_iter()
+                .map(|n| (n.d_id, 1.0 - n.distance))
+                .collect()
+        }
+        Index::IvfPq(ivfpq) => {
+            let knbn = k + inner.tombstones.len().min(k);
+            ivfpq
+                .search(vector, knbn, nprobe.unwrap_or(ivfpq.nprobe))
+                .into_iter()
+                .map(|(idx, dist)| (idx, -dist))
+                .collect()
+        }
+        // Rows are removed physically, so no tombstone over-fetch needed
+        Index::Flat(flat) => flat.search(vector, k),
+        Index::FlatI8(flat) => flat.search(vector, k),
+        // The mapped file is read-only, so rm() tombstones here too -
+        // over-fetch like the graph indexes so callers can filter
+        Index::FlatMmap(mapped) => mapped.search(vector, k + inner.tombstones.len().min(k)),
+    }
+}
+
+/// Rank a normalized query and snapshot the surviving hits' metadata.
+///
+/// Called inside py.detach by every search entry point: the read guard is
+/// acquired AND dropped in here, strictly while the GIL is released.
+/// Holding a lock guard across GIL re-acquisition deadlocks the
+/// interpreter: this thread waits to re-attach while a writer that holds
+/// (or is handed) the GIL blocks on the same lock. Returns the at-most-k
+/// live hits as owned (id, score, title, url, summary) tuples.
+fn snapshot_hits(
+    lock: &RwLock<Inner>,
+    vector: &[f32],
+    k: usize,
+    nprobe: Option<usize>,
+) -> Result<Vec<(String, f32, String, String, String)>, String> {
+    let inner = lock.read().map_err(|e| format!("Lock error: {}", e))?;
+    let hits = ranked_hits(&inner, vector, k, nprobe);
+
+    let mut snapshot = Vec::with_capacity(k.min(hits.len()));
+    for (idx, score) in hits {
+        if inner.tombstones.contains(&idx) {
+            continue;
+        }
+        if snapshot.len() >= k {
+            break;
+        }
+        snapshot.push((
+            inner.meta.ids[idx].clone(),
+            score,
+            inner.meta.titles[idx].clone(),
+            inner.meta.urls[idx].clone(),
+            inner.meta.summaries[idx].clone(),
+        ));
+    }
+    Ok(snapshot)
+}
+
+/// One search hit, built directly in Rust.
+///
+/// A frozen pyclass costs one object allocation per result versus a dict's
+/// hash table plus five boxed key/value inserts, and fields are read through
+/// getters rather than hash lookups. Frozen also makes results immutable
+/// from Python, matching the frozen SearchResult dataclass on the SDK side.
+#[pyclass(frozen)]
+struct SearchResult {
+    #[pyo3(get)]
+    id: String,
+    #[pyo3(get)]
+    score: f32,
+    #[pyo3(get)]
+    title: String,
+    #[pyo3(get)]
+    url: String,
+    #[pyo3(get)]
+    summary: String,
+}
+
+#[pymethods]
+impl SearchResult {
+    /// Convert to a plain dictionary for callers that want dict results.
+    fn to_dict(&self, py: Python) -> PyResult<Py<PyDict>> {
+        let dict = PyDict::new(py);
+        dict.set_item("id", &self.id)?;
+        dict.set_item("score", self.score)?;
+        dict.set_item("title", &self.title)?;
+        dict.set_item("url", &self.url)?;
+        dict.set_item("summary", &self.summary)?;
+        Ok(dict.into())
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "SearchResult(id='{}', score={:.4}, title='{}')",
+            self.id, self.score, self.title
+        )
+    }
+}
+
+/// A vector argument from Python: either a float32 numpy array or a list.
+///
+/// The numpy branch goes through the buffer protocol - one pointer cast
+/// plus a memcpy into the store - where a list costs one PyFloat unbox per
+/// element. Callers holding embeddings as numpy rows (embed_batch output)
+/// should pass them through untouched; .tolist() round-trips are wasted
+/// work.
+#[derive(FromPyObject)]
+enum VectorArg<'py> {
+    Array(PyReadonlyArray1<'py, f32>),
+    List(Vec<f32>),
+}
+
+impl VectorArg<'_> {
+    fn len(&self) -> usize {
+        match self {
+            VectorArg::Array(a) => a.len().unwrap_or(0),
+            VectorArg::List(v) => v.len(),
+        }
+    }
+
+    /// Copy out as an owned Vec (the store normalizes and keeps vectors,
+    /// so an owned buffer is needed either way).
+    fn into_vec(self) -> PyResult<Vec<f32>> {
+        match self {
+            VectorArg::Array(a) => match a.as_slice() {
+                Ok(slice) => Ok(slice.to_vec()),
+                // Non-contiguous views fall back to an element copy
+                Err(_) => Ok(a.to_vec()?),
+            },
+            VectorArg::List(v) => Ok(v),
+        }
+    }
+}
+
+/// Lazy search-result iterator returned by VectorStore.search_iter.
+///
+/// The ranked hits (at most k of them) are snapshotted on the Rust side at
+/// query time; each Python `next()` materializes exactly ONE SearchResult.
+/// Python-side peak memory is O(1) result objects instead of O(k), which
+/// makes search_streaming genuinely streaming rather than iterating over a
+/// pre-built list.
+#[pyclass]
+struct SearchIterator {
+    /// Remaining (id, score, title, url, summary) hits, best first.
+    hits: std::vec::IntoIter<(String, f32, String, String, String)>,
+}
+
+#[pymethods]
+impl SearchIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&mut self, py: Python) -> PyResult<Option<Py<SearchResult>>> {
+        match self.hits.next() {
+            Some((id, score, title, url, summary)) => Ok(Some(Py::new(
+                py,
+                SearchResult {
+                    id,
+                    score,
+                    title,
+                    url,
+                    summary,
+                },
+            )?)),
+            None => Ok(None),
+        }
+    }
+
+    fn __len__(&self) -> usize {
+        self.hits.len()
+    }
+}
+
+/// Vector store that manages embeddings and metadata using an HNSW index
+///
 /// This implementation is optimized for memory efficiency and performance:
 /// - Only stores vectors and metadata (title, url, summary)
 /// - Does NOT store content text - it's discarded after vectorization
 /// - Uses Python callback to convert content to vectors on-the-fly
+/// - HNSW graph gives O(log N) distance evaluations per query instead of
+///   a full O(N·d) linear scan
 /// - Thread-safe with RwLock for concurrent read access
-/// - No unsafe blocks - all operations are memory-safe
+/// - Compute kernels are free of unsafe; the sole unsafe block is the
+///   read-only mmap call in open_mmap
 #[pyclass]
 struct VectorStore {
-    store: Arc<RwLock<VecStore>>,
+    inner: Arc<RwLock<Inner>>,
     dimension: usize,
-    temp_path: Option<PathBuf>,
+}
+
+impl VectorStore {
+    /// Insert a pre-validated vector + metadata under the write lock.
+    fn insert_vector(
+        &self,
+        id: String,
+        mut vector: Vec<f32>,
+        title: String,
+        url: String,
+        summary: String,
+    ) -> PyResult<()> {
+        // Normalize ONCE at insert time; all search paths then score with
+        // plain dot products against a normalized query
+        normalize_in_place(&mut vector);
+
+        let mut inner = self.inner.write().map_err(|e| {
+            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+        })?;
+
+        if matches!(inner.index, Index::FlatMmap(_)) {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "mmap-backed stores are read-only; build with new_flat and save() instead",
+            ));
+        }
+
+        insert_locked(&mut inner, id, vector, title, url, summary);
+        Ok(())
+    }
+}
+
+/// Insert one already-normalized vector + metadata into a locked Inner.
+///
+/// Shared by the single insert_vector path and the batched
+/// set_vector_many path, which amortizes one write-lock acquisition over
+/// a whole slice of documents.
+fn insert_locked(
+    inner: &mut Inner,
+    id: String,
+    vector: Vec<f32>,
+    title: String,
+    url: String,
+    summary: String,
+) {
+    // Upsert semantics: drop any previous version of this id. The flat
+    // index reclaims the row physically; graph-based indexes tombstone.
+    if let Some(old_idx) = inner.id_to_idx.remove(&id) {
+        match &mut inner.index {
+            Index::Flat(flat) => flat.remove(old_idx),
+            Index::FlatI8(flat) => flat.remove(old_idx),
+            _ => {
+                inner.tombstones.insert(old_idx);
+            }
+        }
+    }
+
+    let idx = inner.meta.ids.len();
+    match &mut inner.index {
+        Index::Hnsw { hnsw, .. } => hnsw.insert((&vector, idx)),
+        Index::IvfPq(ivfpq) => ivfpq.insert(idx, vector),
+        Index::Flat(flat) => flat.insert(idx, &vector),
+        Index::FlatI8(flat) => flat.insert(idx, &vector),
+        // Unreachable: callers reject mmap-backed stores before locking
+        Index::FlatMmap(_) => {}
+    }
+    inner.meta.push(id.clone(), title, url, summary);
+    inner.id_to_idx.insert(id, idx);
 }
 
 #[pymethods]
 impl VectorStore {
     /// Create a new VectorStore instance
-    /// 
+    ///
     /// Args:
     ///     dimension: Vector dimension (e.g., 768 for most embedding models)
     #[new]
     fn new(dimension: usize) -> PyResult<Self> {
-        // Create a temporary directory for the vector store
-        let temp_dir = std::env::temp_dir().join(format!("tf_vecstore_{}", uuid::Uuid::new_v4()));
-        std::fs::create_dir_all(&temp_dir).map_err(|e| {
-            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
-                "Failed to create temp directory: {}",
-                e
-            ))
-        })?;
+        let hnsw = Hnsw::new(
+            HNSW_MAX_NB_CONNECTION,
+            HNSW_CAPACITY_HINT,
+            HNSW_MAX_LAYER,
+            HNSW_EF_CONSTRUCTION,
+            DistCosine {},
+        );
 
-        let store = VecStore::open(&temp_dir).map_err(|e| {
-            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
-                "Failed to create vector store: {}",
-                e
-            ))
-        })?;
+        Ok(VectorStore {
+            inner: Arc::new(RwLock::new(Inner {
+                index: Index::Hnsw {
+                    hnsw,
+                    ef_search: DEFAULT_EF_SEARCH,
+                },
+                meta: MetaColumns::new(),
+                id_to_idx: HashMap::new(),
+                tombstones: HashSet::new(),
+            })),
+            dimension,
+        })
+    }
 
+    /// Create a VectorStore backed by an exact flat scan
+    ///
+    /// Vectors live in one contiguous row-major buffer (structure-of-arrays),
+    /// so the scan is a linear sweep over memory rather than a pointer chase.
+    /// Best for small-to-medium stores or when exact results are required;
+    /// removal physically reclaims the row (swap-remove), so flat stores
+    /// never accumulate tombstones.
+    ///
+    /// Args:
+    ///     dimension: Vector dimension
+    #[staticmethod]
+    fn new_flat(dimension: usize) -> PyResult<Self> {
         Ok(VectorStore {
-            store: Arc::new(RwLock::new(store)),
+            inner: Arc::new(RwLock::new(Inner {
+                index: Index::Flat(FlatIndex::new(dimension)),
+                meta: MetaColumns::new(),
+                id_to_idx: HashMap::new(),
+                tombstones: HashSet::new(),
+            })),
             dimension,
-            temp_path: Some(temp_dir),
         })
     }
 
-    /// Set (add/update) a document using Python callback for vectorization
-    /// 
-    /// This is a memory-efficient method that:
-    /// 1. Calls the Python callback function with the content
-    /// 2. Gets the vector from the callback
-    /// 3. Stores only the vector and metadata (title, url, summary)
-    /// 4. Discards the content after vectorization
-    /// 
+    /// Create a VectorStore backed by an int8-quantized flat scan
+    ///
+    /// Same exact-scan layout as new_flat, but each vector is L2-normalized
+    /// and stored as int8 codes plus one f32 scale - roughly 4x less memory
+    /// and scan bandwidth, at a small accuracy cost (typically <1% recall).
+    ///
     /// Args:
-    ///     id: Unique identifier for the document
-    ///     content: Document content (will be vectorized via callback then discarded)
-    ///     title: Document title (stored)
-    ///     url: Document URL (stored)
-    ///     summary: Document summary (stored, optional)
-    ///     embedding_callback: Python callable that takes content and returns vector
-    fn set(
-        &mut self,
-        py: Python,
-        id: String,
-        content: String,
-        title: String,
-        url: String,
-        summary: String,
-        embedding_callback: Py<PyAny>,
-    ) -> PyResult<()> {
-        // Call Python callback to get embedding vector
-        let vector: Vec<f32> = embedding_callback.call1(py, (content,))?.extract(py)?;
+    ///     dimension: Vector dimension
+    #[staticmethod]
+    fn new_flat_i8(dimension: usize) -> PyResult<Self> {
+        Ok(VectorStore {
+            inner: Arc::new(RwLock::new(Inner {
+                index: Index::FlatI8(FlatI8Index::new(dimension)),
+                meta: MetaColumns::new(),
+                id_to_idx: HashMap::new(),
+                tombstones: HashSet::new(),
+            })),
+            dimension,
+        })
+    }
 
-        // Validate vector dimension
-        if vector.len() != self.dimension {
+    /// Create a VectorStore backed by a compressed IVF-PQ index
+    ///
+    /// Each vector is stored as `m_subvectors` uint8 codes instead of
+    /// `dimension` float32s - an 8-32x memory reduction - and search scores
+    /// candidates via lookup tables rather than full dot products. Codebooks
+    /// are trained with K-means once enough vectors have been inserted;
+    /// before that, search runs an exact scan over the buffered vectors.
+    ///
+    /// Args:
+    ///     dimension: Vector dimension (must be divisible by m_subvectors)
+    ///     nlist: Number of coarse centroids (inverted lists)
+    ///     m_subvectors: Number of PQ segments per vector
+    ///     nbits: Bits per PQ code (default: 8, i.e. 256 codebook entries)
+    #[staticmethod]
+    #[pyo3(signature = (dimension, nlist, m_subvectors, nbits=8))]
+    fn new_ivfpq(
+        dimension: usize,
+        nlist: usize,
+        m_subvectors: usize,
+        nbits: usize,
+    ) -> PyResult<Self> {
+        if m_subvectors == 0 || dimension % m_subvectors != 0 {
             return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
-                "Vector dimension mismatch. Expected {}, got {}",
-                self.dimension,
-                vector.len()
+                "dimension {} must be divisible by m_subvectors {}",
+                dimension, m_subvectors
             )));
         }
+        if nbits == 0 || nbits > 8 {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "nbits must be between 1 and 8",
+            ));
+        }
 
-        // Create metadata - store title, url, and summary, NOT content
-        // This is the key to memory efficiency!
-        let mut metadata = Metadata {
-            fields: HashMap::new(),
-        };
-        metadata.fields.insert("title".to_string(), json!(title));
-        metadata.fields.insert("url".to_string(), json!(url));
-        metadata.fields.insert("summary".to_string(), json!(summary));
-
-        // Upsert vector with metadata
-        // After this point, content is dropped and memory is freed
-        self.store
-            .write()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?
-            .upsert(id, vector, metadata)
-            .map_err(|e| {
-                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
-                    "Failed to add vector: {}",
-                    e
-                ))
+        Ok(VectorStore {
+            inner: Arc::new(RwLock::new(Inner {
+                index: Index::IvfPq(IvfPq::new(dimension, nlist.max(1), m_subvectors, nbits)),
+                meta: MetaColumns::new(),
+                id_to_idx: HashMap::new(),
+                tombstones: HashSet::new(),
+            })),
+            dimension,
+        })
+    }
+
+    /// Persist a flat store to disk for zero-copy reopening
+    ///
+    /// Layout: a 64-byte header (magic, dimension, count), the raw f32
+    /// vector block starting 64-byte aligned, then a length-prefixed
+    /// metadata blob. Rows are written compacted in row order, so the file
+    /// carries no tombstones. Only flat (new_flat) stores can be saved -
+    /// graph and PQ indexes don't keep their raw vectors in a serializable
+    /// form.
+    ///
+    /// Args:
+    ///     path: Destination file path
+    fn save(&self, py: Python, path: String) -> PyResult<()> {
+        // Read lock + file I/O all run detached; the guard never lives
+        // across a GIL re-acquisition
+        py.detach(|| {
+            let inner = self.inner.read().map_err(|e| {
+                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
             })?;
 
-        Ok(())
+            let flat = match &inner.index {
+                Index::Flat(flat) => flat,
+                _ => {
+                    return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                        "save is only supported for flat stores (new_flat)",
+                    ));
+                }
+            };
+
+            let mut header = [0u8; STORE_HEADER_LEN];
+            header[..8].copy_from_slice(STORE_MAGIC);
+            header[8..16].copy_from_slice(&(self.dimension as u64).to_le_bytes());
+            header[16..24].copy_from_slice(&(flat.doc_idx.len() as u64).to_le_bytes());
+
+            let mut meta_blob = Vec::new();
+            for &idx in &flat.doc_idx {
+                write_str(&mut meta_blob, &inner.meta.ids[idx]);
+                write_str(&mut meta_blob, &inner.meta.titles[idx]);
+                write_str(&mut meta_blob, &inner.meta.urls[idx]);
+                write_str(&mut meta_blob, &inner.meta.summaries[idx]);
+            }
+
+            let mut out = BufWriter::new(File::create(path)?);
+            out.write_all(&header)?;
+            // Rows are written at logical dimension - padding blocks stay
+            // in-memory only, the file format is unchanged
+            for row in 0..flat.doc_idx.len() {
+                out.write_all(bytemuck::cast_slice(flat.row(row)))?;
+            }
+            out.write_all(&meta_blob)?;
+            out.flush()?;
+            Ok(())
+        })
     }
 
-    /// Set a document with pre-computed vector (for batch operations)
-    /// 
-    /// Use this when you already have the vector and don't need the callback.
-    /// 
+    /// Open a saved store read-only via mmap
+    ///
+    /// The vector block is never copied onto the heap: searches read f32
+    /// rows straight from the OS page cache, cold start is one mmap call
+    /// regardless of store size, and multiple processes opening the same
+    /// file share the physical pages. Metadata strings (small relative to
+    /// the vectors) are loaded into RAM. The returned store rejects inserts;
+    /// rm() tombstones entries in memory without touching the file.
+    ///
+    /// Args:
+    ///     path: Store file previously written by save()
+    #[staticmethod]
+    fn open_mmap(path: String) -> PyResult<Self> {
+        let file = File::open(&path)?;
+        // SAFETY: the mapping is read-only and parsed as untrusted bytes;
+        // the documented contract is that the file is not truncated or
+        // rewritten while the store is open.
+        let mmap = unsafe { Mmap::map(&file) }?;
+
+        if mmap.len() < STORE_HEADER_LEN || &mmap[..8] != STORE_MAGIC {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Not a TF vector store file: {}",
+                path
+            )));
+        }
+        let dimension = u64::from_le_bytes(mmap[8..16].try_into().unwrap()) as usize;
+        let n = u64::from_le_bytes(mmap[16..24].try_into().unwrap()) as usize;
+        let vec_end = STORE_HEADER_LEN + n * dimension * 4;
+        if mmap.len() < vec_end {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "Corrupt store file: truncated vector block",
+            ));
+        }
+
+        let meta_bytes = &mmap[vec_end..];
+        let mut meta = MetaColumns::new();
+        let mut id_to_idx = HashMap::with_capacity(n);
+        let mut pos = 0usize;
+        for idx in 0..n {
+            let id = read_str(meta_bytes, &mut pos)?;
+            let title = read_str(meta_bytes, &mut pos)?;
+            let url = read_str(meta_bytes, &mut pos)?;
+            let summary = read_str(meta_bytes, &mut pos)?;
+            id_to_idx.insert(id.clone(), idx);
+            meta.push(id, title, url, summary);
+        }
+
+        Ok(VectorStore {
+            inner: Arc::new(RwLock::new(Inner {
+                index: Index::FlatMmap(MmapIndex {
+                    dim: dimension,
+                    n,
+                    mmap,
+                }),
+                meta,
+                id_to_idx,
+                tombstones: HashSet::new(),
+            })),
+            dimension,
+        })
+    }
+
+    /// Set (add/update) a document with a pre-computed vector
+    ///
+    /// The single insert entry point: callers embed in Python and pass the
+    /// vector here. The former callback variant (set) had Rust re-enter
+    /// Python to run the embedder - two extra FFI crossings per insert for
+    /// a content string Rust never needed to own - and was removed.
+    ///
     /// Args:
     ///     id: Unique identifier for the document
-    ///     vector: Pre-computed embedding vector
+    ///     vector: Pre-computed embedding vector - a float32 numpy array
+    ///             (zero-copy via the buffer protocol) or a list of floats
     ///     title: Document title
     ///     url: Document URL
     ///     summary: Document summary (optional)
+    #[pyo3(signature = (id, vector, title, url, summary=None))]
     fn set_vector(
-        &mut self,
+        &self,
+        py: Python,
         id: String,
-        vector: Vec<f32>,
+        vector: VectorArg,
         title: String,
         url: String,
         summary: Option<String>,
@@ -139,29 +1413,119 @@ impl VectorStore {
                 vector.len()
             )));
         }
+        let vector = vector.into_vec()?;
 
-        // Create metadata - title, url, and summary, no content
-        let mut metadata = Metadata {
-            fields: HashMap::new(),
-        };
-        metadata.fields.insert("title".to_string(), json!(title));
-        metadata.fields.insert("url".to_string(), json!(url));
-        if let Some(sum) = summary {
-            metadata.fields.insert("summary".to_string(), json!(sum));
-        }
-
-        self.store
-            .write()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?
-            .upsert(id, vector, metadata)
-            .map_err(|e| {
-                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
-                    "Failed to add vector: {}",
-                    e
-                ))
+        // Normalization and the index insert don't touch Python objects -
+        // run them detached so concurrent adds overlap instead of queueing
+        // on the interpreter
+        py.detach(|| self.insert_vector(id, vector, title, url, summary.unwrap_or_default()))
+    }
+
+    /// Set a whole batch of documents in one call (bulk Create operation)
+    ///
+    /// The embedded batch arrives as a single (n, dim) float32 matrix -
+    /// one borrow of the numpy buffer instead of n per-row conversions -
+    /// with parallel metadata columns. Rows are normalized and inserted
+    /// under ONE write-lock acquisition, with the GIL detached for the
+    /// whole pass, so flat-store arenas grow contiguously and Python
+    /// threads keep running during index construction.
+    ///
+    /// Args:
+    ///     ids: Document identifiers (length n)
+    ///     matrix: (n, dim) float32 numpy array, one embedding per row
+    ///     titles: Document titles (length n)
+    ///     urls: Document URLs (length n)
+    ///     summaries: Document summaries (length n)
+    fn set_vector_many(
+        &self,
+        py: Python,
+        ids: Vec<String>,
+        matrix: PyReadonlyArray2<f32>,
+        titles: Vec<String>,
+        urls: Vec<String>,
+        summaries: Vec<String>,
+    ) -> PyResult<()> {
+        let view = matrix.as_array();
+        let n = view.nrows();
+        if ids.len() != n || titles.len() != n || urls.len() != n || summaries.len() != n {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Column length mismatch: {} rows but {}/{}/{}/{} ids/titles/urls/summaries",
+                n,
+                ids.len(),
+                titles.len(),
+                urls.len(),
+                summaries.len()
+            )));
+        }
+        if n > 0 && view.ncols() != self.dimension {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Vector dimension mismatch. Expected {}, got {}",
+                self.dimension,
+                view.ncols()
+            )));
+        }
+
+        // Copy the rows out while the buffer borrow is live; the indexes
+        // copy on insert anyway, so this is the same total traffic
+        let mut rows: Vec<Vec<f32>> = view.outer_iter().map(|r| r.to_vec()).collect();
+
+        py.detach(|| {
+            for row in &mut rows {
+                normalize_in_place(row);
+            }
+
+            let mut inner = self.inner.write().map_err(|e| {
+                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
             })?;
 
-        Ok(())
+            if matches!(inner.index, Index::FlatMmap(_)) {
+                return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                    "mmap-backed stores are read-only; build with new_flat and save() instead",
+                ));
+            }
+
+            for ((((id, vector), title), url), summary) in ids
+                .into_iter()
+                .zip(rows)
+                .zip(titles)
+                .zip(urls)
+                .zip(summaries)
+            {
+                insert_locked(&mut inner, id, vector, title, url, summary);
+            }
+            Ok(())
+        })
+    }
+
+    /// Set the HNSW search beam width (ef_search)
+    ///
+    /// Larger values explore more graph neighbours per query: better recall,
+    /// slower search. Must be >= k.
+    ///
+    /// Args:
+    ///     ef: Beam width (default: 50)
+    fn set_ef(&self, py: Python, ef: usize) -> PyResult<()> {
+        // Wait for the write lock detached - blocking on it with the GIL
+        // held stalls every Python thread behind an in-flight search
+        py.detach(|| {
+            let mut inner = self.inner.write().map_err(|e| {
+                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+            })?;
+            match &mut inner.index {
+                Index::Hnsw { ef_search, .. } => {
+                    *ef_search = ef.max(1);
+                    Ok(())
+                }
+                Index::IvfPq(_) => Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                    "set_ef only applies to HNSW-backed stores; use nprobe on search instead",
+                )),
+                Index::Flat(_) | Index::FlatI8(_) | Index::FlatMmap(_) => {
+                    Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                        "set_ef only applies to HNSW-backed stores; flat stores are always exact",
+                    ))
+                }
+            }
+        })
     }
 
     /// Search for similar vectors with optimized memory usage
@@ -170,17 +1534,23 @@ impl VectorStore {
     /// Only metadata is returned, vectors are NOT included to save memory.
     ///
     /// Args:
-    ///     vector: Query vector (list of floats)
+    ///     vector: Query vector - float32 numpy array (zero-copy) or list
     ///     k: Number of results to return (default: 5)
+    ///     nprobe: IVF-PQ only - number of inverted lists to probe
+    ///             (default: 8); ignored by HNSW-backed stores
     ///
     /// Returns:
-    ///     List of dictionaries sorted by score (descending) with:
-    ///     - id: Document identifier
-    ///     - score: Relevance score (higher = more relevant)
-    ///     - title: Document title
-    ///     - url: Document URL
-    ///     - summary: Document summary
-    fn search(&self, py: Python, vector: Vec<f32>, k: Option<usize>) -> PyResult<Py<PyList>> {
+    ///     List of SearchResult objects sorted by score (descending) with
+    ///     attributes: id, score, title, url, summary. Call to_dict() on a
+    ///     result if a plain dictionary is needed.
+    #[pyo3(signature = (vector, k=None, nprobe=None))]
+    fn search(
+        &self,
+        py: Python,
+        vector: VectorArg,
+        k: Option<usize>,
+        nprobe: Option<usize>,
+    ) -> PyResult<Py<PyList>> {
         if vector.len() != self.dimension {
             return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
                 "Vector dimension mismatch. Expected {}, got {}",
@@ -188,88 +1558,222 @@ impl VectorStore {
                 vector.len()
             )));
         }
+        let mut vector = vector.into_vec()?;
 
         let k = k.unwrap_or(5);
 
-        // Create query
-        let query = Query {
-            vector,
-            k,
-            filter: None,
-        };
+        // Normalize the query once, outside any candidate loop
+        normalize_in_place(&mut vector);
 
-        // Execute query with read lock for concurrent access
-        // Results are already sorted by vecstore (highest score first)
-        let results = self.store.read()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?
-            .query(query)
-            .map_err(|e| {
-                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Search failed: {}", e))
-            })?;
+        // Lock, scan, and snapshot entirely with the GIL released - the
+        // read guard must never outlive the detached closure (see
+        // snapshot_hits). See ranked_hits for score conventions and the
+        // tombstone over-fetch.
+        let hits = py
+            .detach(|| snapshot_hits(&self.inner, &vector, k, nprobe))
+            .map_err(PyErr::new::<pyo3::exceptions::PyRuntimeError, _>)?;
 
-        // Convert results to Python list - stream processing for memory efficiency
-        // Create list with pre-allocated capacity
         let result_list = PyList::empty(py);
 
-        for result in results {
-            // Create dict only for fields we need - no vectors
-            let dict = PyDict::new(py);
-            dict.set_item("id", &result.id)?;
-            dict.set_item("score", result.score)?;
-
-            // Extract metadata fields (title, url, summary - no content, no vector)
-            if let Some(title) = result.metadata.fields.get("title") {
-                if let Some(title_str) = title.as_str() {
-                    dict.set_item("title", title_str)?;
-                } else {
-                    dict.set_item("title", "")?;
-                }
-            } else {
-                dict.set_item("title", "")?;
-            }
-            
-            if let Some(url) = result.metadata.fields.get("url") {
-                if let Some(url_str) = url.as_str() {
-                    dict.set_item("url", url_str)?;
-                } else {
-                    dict.set_item("url", "")?;
-                }
-            } else {
-                dict.set_item("url", "")?;
-            }
-            
-            if let Some(summary) = result.metadata.fields.get("summary") {
-                if let Some(summary_str) = summary.as_str() {
-                    dict.set_item("summary", summary_str)?;
-                } else {
-                    dict.set_item("summary", "")?;
-                }
-            } else {
-                dict.set_item("summary", "")?;
-            }
-
-            result_list.append(dict)?;
+        for (id, score, title, url, summary) in hits {
+            // One frozen object per hit - no dict, no per-field hash inserts
+            result_list.append(Py::new(
+                py,
+                SearchResult {
+                    id,
+                    score,
+                    title,
+                    url,
+                    summary,
+                },
+            )?)?;
         }
 
         Ok(result_list.into())
     }
 
+    /// Search, returning parallel columns instead of result objects
+    ///
+    /// Structure-of-arrays at the FFI boundary: the hits come back as five
+    /// parallel sequences instead of one Python object per hit, so bulk
+    /// consumers (dict builders, dataframes) do k fewer PyObject
+    /// constructions and read each field column contiguously. Scores are a
+    /// float32 numpy array built in Rust.
+    ///
+    /// Args:
+    ///     vector: Query vector - float32 numpy array (zero-copy) or list
+    ///     k: Number of results to return (default: 5)
+    ///     nprobe: IVF-PQ only - number of inverted lists to probe
+    ///
+    /// Returns:
+    ///     Tuple (ids, scores, titles, urls, summaries): scores is a numpy
+    ///     float32 array, the other four are lists of str, all row-aligned
+    ///     and sorted best first
+    #[pyo3(signature = (vector, k=None, nprobe=None))]
+    #[allow(clippy::type_complexity)]
+    fn search_columns<'py>(
+        &self,
+        py: Python<'py>,
+        vector: VectorArg,
+        k: Option<usize>,
+        nprobe: Option<usize>,
+    ) -> PyResult<(
+        Vec<String>,
+        Bound<'py, PyArray1<f32>>,
+        Vec<String>,
+        Vec<String>,
+        Vec<String>,
+    )> {
+        if vector.len() != self.dimension {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Vector dimension mismatch. Expected {}, got {}",
+                self.dimension,
+                vector.len()
+            )));
+        }
+        let mut vector = vector.into_vec()?;
+
+        let k = k.unwrap_or(5);
+        normalize_in_place(&mut vector);
+
+        // Guard lifetime is confined to the detached closure (snapshot_hits)
+        let hits = py
+            .detach(|| snapshot_hits(&self.inner, &vector, k, nprobe))
+            .map_err(PyErr::new::<pyo3::exceptions::PyRuntimeError, _>)?;
+
+        let cap = hits.len();
+        let mut ids = Vec::with_capacity(cap);
+        let mut scores = Vec::with_capacity(cap);
+        let mut titles = Vec::with_capacity(cap);
+        let mut urls = Vec::with_capacity(cap);
+        let mut summaries = Vec::with_capacity(cap);
+
+        for (id, score, title, url, summary) in hits {
+            ids.push(id);
+            scores.push(score);
+            titles.push(title);
+            urls.push(url);
+            summaries.push(summary);
+        }
+
+        Ok((ids, scores.into_pyarray(py), titles, urls, summaries))
+    }
+
+    /// Search, returning a lazy iterator instead of a built list
+    ///
+    /// Ranking happens eagerly (the index must be scanned to know the top-k
+    /// anyway), but only the at-most-k surviving hits are snapshotted on the
+    /// Rust side; each Python next() then builds exactly one result dict.
+    /// Use this from streaming call sites so peak Python memory stays O(1)
+    /// in the number of results.
+    ///
+    /// Args:
+    ///     vector: Query vector - float32 numpy array (zero-copy) or list
+    ///     k: Number of results to return (default: 5)
+    ///     nprobe: IVF-PQ only - number of inverted lists to probe
+    ///
+    /// Returns:
+    ///     Iterator yielding SearchResult objects, best first
+    #[pyo3(signature = (vector, k=None, nprobe=None))]
+    fn search_iter(
+        &self,
+        py: Python,
+        vector: VectorArg,
+        k: Option<usize>,
+        nprobe: Option<usize>,
+    ) -> PyResult<SearchIterator> {
+        if vector.len() != self.dimension {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(format!(
+                "Vector dimension mismatch. Expected {}, got {}",
+                self.dimension,
+                vector.len()
+            )));
+        }
+        let mut vector = vector.into_vec()?;
+
+        let k = k.unwrap_or(5);
+        normalize_in_place(&mut vector);
+
+        // Same ranking as search(); the snapshot means the iterator holds
+        // no lock, and the guard never outlives the detached closure
+        let snapshot = py
+            .detach(|| snapshot_hits(&self.inner, &vector, k, nprobe))
+            .map_err(PyErr::new::<pyo3::exceptions::PyRuntimeError, _>)?;
+
+        Ok(SearchIterator {
+            hits: snapshot.into_iter(),
+        })
+    }
+
     /// Remove a vector and its metadata (Delete operation)
     ///
+    /// HNSW graphs do not support physical deletion, so the entry is
+    /// tombstoned: it stays in the graph (preserving connectivity) but is
+    /// filtered from all future results.
+    ///
     /// Args:
     ///     id: Unique identifier of the document to remove
-    fn rm(&mut self, id: String) -> PyResult<()> {
-        self.store.write()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?
-            .delete(&id)
-            .map_err(|e| {
-                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!(
-                    "Failed to remove vector: {}",
-                    e
-                ))
+    fn rm(&self, py: Python, id: String) -> PyResult<()> {
+        // Wait for the write lock detached so a search holding the read
+        // lock can finish without this thread pinning the GIL
+        py.detach(|| {
+            let mut inner = self.inner.write().map_err(|e| {
+                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
             })?;
 
-        Ok(())
+            match inner.id_to_idx.remove(&id) {
+                Some(idx) => {
+                    match &mut inner.index {
+                        Index::Flat(flat) => flat.remove(idx),
+                        Index::FlatI8(flat) => flat.remove(idx),
+                        _ => {
+                            inner.tombstones.insert(idx);
+                        }
+                    }
+                    Ok(())
+                }
+                None => Err(PyErr::new::<pyo3::exceptions::PyKeyError, _>(format!(
+                    "Document not found: {}",
+                    id
+                ))),
+            }
+        })
+    }
+
+    /// Remove several documents in one call (bulk Delete operation)
+    ///
+    /// Semantically identical to calling rm() per id, but the whole batch
+    /// crosses the FFI boundary once and the write lock is acquired once,
+    /// instead of N boundary crossings and N lock round-trips.
+    ///
+    /// Args:
+    ///     ids: Unique identifiers of the documents to remove
+    fn rm_many(&self, py: Python, ids: Vec<String>) -> PyResult<()> {
+        // Same detached lock-wait as rm(), amortized over the batch
+        py.detach(|| {
+            let mut inner = self.inner.write().map_err(|e| {
+                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+            })?;
+
+            for id in ids {
+                match inner.id_to_idx.remove(&id) {
+                    Some(idx) => match &mut inner.index {
+                        Index::Flat(flat) => flat.remove(idx),
+                        Index::FlatI8(flat) => flat.remove(idx),
+                        _ => {
+                            inner.tombstones.insert(idx);
+                        }
+                    },
+                    None => {
+                        return Err(PyErr::new::<pyo3::exceptions::PyKeyError, _>(format!(
+                            "Document not found: {}",
+                            id
+                        )));
+                    }
+                }
+            }
+            Ok(())
+        })
     }
 
     /// Update metadata for an existing document
@@ -279,51 +1783,58 @@ impl VectorStore {
     ///     title: New title (optional)
     ///     url: New URL (optional)
     ///     summary: New summary (optional)
-    fn update(&mut self, id: String, title: Option<String>, url: Option<String>, summary: Option<String>) -> PyResult<()> {
-        let mut store = self.store.write()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?;
-        
-        let all_records = store.list_active();
-        
-        // Find the record
-        for record in all_records {
-            if record.id == id {
-                let mut metadata = record.metadata.clone();
-                
-                // Update fields if provided
-                if let Some(t) = title {
-                    metadata.fields.insert("title".to_string(), json!(t));
-                }
-                if let Some(u) = url {
-                    metadata.fields.insert("url".to_string(), json!(u));
-                }
-                if let Some(s) = summary {
-                    metadata.fields.insert("summary".to_string(), json!(s));
+    fn update(
+        &self,
+        py: Python,
+        id: String,
+        title: Option<String>,
+        url: Option<String>,
+        summary: Option<String>,
+    ) -> PyResult<()> {
+        // Detached lock-wait, as in rm()
+        py.detach(|| {
+            let mut inner = self.inner.write().map_err(|e| {
+                PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+            })?;
+
+            let idx = match inner.id_to_idx.get(&id) {
+                Some(&idx) => idx,
+                None => {
+                    return Err(PyErr::new::<pyo3::exceptions::PyKeyError, _>(format!(
+                        "Document not found: {}",
+                        id
+                    )));
                 }
-                
-                // Update in store
-                store.update_metadata(&id, metadata)
-                    .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Failed to update: {}", e)))?;
-                
-                return Ok(());
+            };
+
+            if let Some(t) = title {
+                inner.meta.titles[idx] = t;
             }
-        }
-        
-        Err(PyErr::new::<pyo3::exceptions::PyKeyError, _>(format!("Document not found: {}", id)))
+            if let Some(u) = url {
+                inner.meta.urls[idx] = u;
+            }
+            if let Some(s) = summary {
+                inner.meta.summaries[idx] = s;
+            }
+
+            Ok(())
+        })
     }
 
     /// Get the number of vectors in the store
     fn len(&self) -> PyResult<usize> {
-        Ok(self.store.read()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?
-            .len())
+        let inner = self.inner.read().map_err(|e| {
+            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+        })?;
+        Ok(inner.id_to_idx.len())
     }
 
     /// Check if the store is empty
     fn is_empty(&self) -> PyResult<bool> {
-        Ok(self.store.read()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?
-            .is_empty())
+        let inner = self.inner.read().map_err(|e| {
+            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+        })?;
+        Ok(inner.id_to_idx.is_empty())
     }
 
     /// Get metadata for a specific document (Read operation)
@@ -334,50 +1845,36 @@ impl VectorStore {
     /// Returns:
     ///     Dictionary containing title, url, and summary (no content)
     fn get(&self, py: Python, id: String) -> PyResult<Py<PyAny>> {
-        let store = self.store.read()
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e)))?;
-        let all_records = store.list_active();
+        let inner = self.inner.read().map_err(|e| {
+            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+        })?;
 
-        // Find the record with matching id
-        for record in all_records {
-            if record.id == id {
+        match inner.id_to_idx.get(&id) {
+            Some(&idx) => {
                 let dict = PyDict::new(py);
-
-                if let Some(title) = record.metadata.fields.get("title") {
-                    if let Some(title_str) = title.as_str() {
-                        dict.set_item("title", title_str)?;
-                    }
-                }
-                if let Some(url) = record.metadata.fields.get("url") {
-                    if let Some(url_str) = url.as_str() {
-                        dict.set_item("url", url_str)?;
-                    }
-                }
-                if let Some(summary) = record.metadata.fields.get("summary") {
-                    if let Some(summary_str) = summary.as_str() {
-                        dict.set_item("summary", summary_str)?;
-                    }
-                }
-
-                return Ok(dict.into());
+                dict.set_item("title", &inner.meta.titles[idx])?;
+                dict.set_item("url", &inner.meta.urls[idx])?;
+                dict.set_item("summary", &inner.meta.summaries[idx])?;
+                Ok(dict.into())
             }
+            None => Ok(py.None()),
         }
-
-        Ok(py.None())
     }
-    
+
     /// Alias for get() to maintain backward compatibility
     fn get_metadata(&self, py: Python, id: String) -> PyResult<Py<PyAny>> {
         self.get(py, id)
     }
-}
 
-impl Drop for VectorStore {
-    fn drop(&mut self) {
-        // Clean up temporary directory
-        if let Some(ref path) = self.temp_path {
-            let _ = std::fs::remove_dir_all(path);
-        }
+    /// Check whether a document id exists (membership test)
+    ///
+    /// Only probes the id map - no metadata dict or string allocations,
+    /// so `doc_id in store` stays cheap in dedupe-before-ingest loops.
+    fn contains(&self, id: &str) -> PyResult<bool> {
+        let inner = self.inner.read().map_err(|e| {
+            PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("Lock error: {}", e))
+        })?;
+        Ok(inner.id_to_idx.contains_key(id))
     }
 }
 
@@ -385,5 +1882,7 @@ impl Drop for VectorStore {
 #[pymodule]
 fn tf_rust(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<VectorStore>()?;
+    m.add_class::<SearchResult>()?;
+    m.add_class::<SearchIterator>()?;
     Ok(())
 }
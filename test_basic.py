@@ -2,6 +2,10 @@
 简单的测试脚本，验证核心功能
 """
 
+import io
+import sys
+
+
 def test_basic_functionality():
     """测试基本功能（不使用真实模型）"""
     print("=== 测试基本功能 ===\n")
@@ -57,13 +61,13 @@ def test_basic_functionality():
         
         if len(results) > 0:
             result = results[0]
-            print(f"   - ID: {result['id']}")
-            print(f"   - Score: {result['score']:.4f}")
-            print(f"   - Title: {result['title']}")
-            print(f"   - URL: {result['url']}")
-            print(f"   - Content字段存在: {'content' in result}")
-            
-            assert 'content' not in result, "Content should NOT be stored!"
+            print(f"   - ID: {result.id}")
+            print(f"   - Score: {result.score:.4f}")
+            print(f"   - Title: {result.title}")
+            print(f"   - URL: {result.url}")
+            print(f"   - Content字段存在: {hasattr(result, 'content')}")
+
+            assert not hasattr(result, 'content'), "Content should NOT be stored!"
             print("   ✓ 确认：content未存储（内存优化成功！）")
     except Exception as e:
         print(f"   ✗ 搜索失败: {e}")
@@ -105,40 +109,29 @@ def test_basic_functionality():
 
 
 def test_callback_mechanism():
-    """测试Python回调机制"""
-    print("\n\n=== 测试Python回调机制 ===\n")
+    """测试预嵌入直插机制（替代旧的回调机制）"""
+    print("\n\n=== 测试预嵌入直插机制 ===\n")
     
     try:
         from tf_rust import VectorStore
         
         store = VectorStore(768)
         
-        # 创建一个简单的回调函数
-        call_count = [0]  # 使用列表来跟踪调用次数
-        
-        def mock_embedder(text: str):
-            """模拟嵌入函数"""
-            call_count[0] += 1
-            print(f"   回调被调用 (第{call_count[0]}次): text长度={len(text)}")
-            # 返回一个简单的向量
-            return [0.1 + i * 0.001 for i in range(768)]
-        
-        # 使用回调添加文档
-        print("1. 使用回调添加文档...")
+        # 在Python侧先计算向量，再直接传给Rust（不再通过回调往返）
+        print("1. 预嵌入后添加文档...")
         content = "这是一段测试内容，将被向量化后丢弃。" * 10
+        vector = [0.1 + i * 0.001 for i in range(768)]
         
-        store.set(
+        store.set_vector(
             "callback_test",
-            content,
-            "回调测试",
-            "https://example.com/callback",
-            mock_embedder
+            vector,
+            "直插测试",
+            "https://example.com/callback"
         )
         
         print(f"   ✓ 文档添加成功")
-        print(f"   ✓ 回调函数被调用了 {call_count[0]} 次")
         print(f"   ✓ 内容长度: {len(content)} 字符")
-        print(f"   ✓ 内容已被丢弃（未存储）")
+        print(f"   ✓ 内容未跨越FFI边界（留在Python侧并被丢弃）")
         
         # 验证文档存在
         print("\n2. 验证文档存在...")
@@ -151,22 +144,27 @@ def test_callback_mechanism():
         # 清理
         store.rm("callback_test")
         
-        print("\n=== 回调机制测试通过！ ===")
+        print("\n=== 直插机制测试通过！ ===")
         return True
         
     except Exception as e:
-        print(f"\n✗ 回调机制测试失败: {e}")
+        print(f"\n✗ 直插机制测试失败: {e}")
         import traceback
         traceback.print_exc()
         return False
 
 
 if __name__ == "__main__":
+    # 块缓冲stdout：多次print合并为少量大块写入，而非每行一次系统调用
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, line_buffering=False)
+
     success = test_basic_functionality()
-    
+    sys.stdout.flush()
+
     if success:
         success = test_callback_mechanism()
-    
+        sys.stdout.flush()
+
     if success:
         print("\n" + "="*50)
         print("🎉 所有测试成功！系统工作正常！")
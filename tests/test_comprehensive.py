@@ -14,23 +14,31 @@ Uses shared DocumentStore instance to avoid lock contention.
 
 import pytest
 import threading
+import tracemalloc
+import types
 from typing import List, Dict
-from tf import DocumentStore, SearchResult, TextEmbedder
+from tf import DocumentStore, SearchResult, get_default_embedder
 
 
 # Shared store instance for all tests to avoid lock issues
-@pytest.fixture(scope="module")
-def shared_store():
+@pytest.fixture(scope="session")
+def shared_store(embedder):
     """Create a shared DocumentStore instance for all tests."""
-    store = DocumentStore()
+    store = DocumentStore(embedder=embedder)
     yield store
     # Cleanup after all tests
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def embedder():
-    """Create a shared TextEmbedder instance."""
-    return TextEmbedder()
+    """The process-wide shared TextEmbedder - loaded once per test run."""
+    return get_default_embedder()
+
+
+@pytest.fixture
+def fresh_store(embedder):
+    """An empty per-test store sharing the session embedder (no model load)."""
+    return DocumentStore(embedder=embedder)
 
 
 class TestDocumentStoreInitialization:
@@ -249,9 +257,9 @@ class TestSearchOperations:
     """Test search functionality."""
     
     @pytest.fixture(scope="class")
-    def search_store(self):
+    def search_store(self, embedder):
         """Create a store with test documents for searching."""
-        store = DocumentStore()
+        store = DocumentStore(embedder=embedder)
         
         docs = [
             {
@@ -343,7 +351,27 @@ class TestSearchOperations:
         
         assert count > 0
         assert count <= 3
-    
+
+    def test_search_streaming_early_break(self, search_store):
+        """Breaking out early leaves the rest of the results unbuilt."""
+        stream = search_store.search_streaming("artificial intelligence", k=3)
+        first = next(stream)
+        assert isinstance(first, SearchResult)
+        # Abandoning the generator must not raise - remaining hits are
+        # only materialized on demand by the Rust iterator
+        stream.close()
+
+    def test_rerank(self, search_store):
+        """Test rerank() keeps the top-k under new scores."""
+        results = search_store.search("machine learning", k=3)
+        # Reverse the ranking with external scores
+        new_scores = list(range(len(results)))
+        reranked = DocumentStore.rerank(results, new_scores, k=2)
+
+        assert len(reranked) == 2
+        assert reranked[0]['id'] == results[-1]['id']
+        assert reranked[0]['score'] >= reranked[1]['score']
+
     def test_search_by_vector(self, search_store, embedder):
         """Test search with pre-computed vector."""
         # Get a query vector
@@ -376,13 +404,20 @@ class TestUtilityMethods:
         count = shared_store.count()
         assert len(shared_store) == count
     
-    def test_is_empty(self):
+    def test_is_empty(self, fresh_store):
         """Test is_empty() method."""
-        empty_store = DocumentStore()
-        assert empty_store.is_empty()
-        
-        empty_store.add("test", "content")
-        assert not empty_store.is_empty()
+        assert fresh_store.is_empty()
+
+        fresh_store.add("test", "content")
+        assert not fresh_store.is_empty()
+
+    def test_context_manager(self, embedder):
+        """Test close() via the context-manager protocol."""
+        with DocumentStore(embedder=embedder) as store:
+            store.add("ctx_1", "Context manager test content.")
+            assert store.count() == 1
+        # close() is idempotent
+        store.close()
 
 
 class TestThreadSafety:
@@ -451,30 +486,68 @@ class TestThreadSafety:
             metadata = shared_store.get(f"concurrent_add_{i}")
             assert metadata is not None
 
+    def test_concurrent_search_and_delete(self, fresh_store):
+        """Mixed readers and writers must not deadlock the interpreter."""
+        # Readers re-attach to the GIL after scanning while writers wait
+        # on the store's write lock - this combination froze the process
+        # when a lock guard was held across GIL re-acquisition
+        for i in range(20):
+            fresh_store.add(
+                doc_id=f"mixed_{i}",
+                content=f"Mixed workload content number {i}."
+            )
+
+        errors = []
+
+        def search_worker():
+            try:
+                for _ in range(10):
+                    fresh_store.search("mixed workload", k=5)
+            except Exception as e:
+                errors.append(e)
+
+        def delete_worker():
+            try:
+                for i in range(10):
+                    fresh_store.delete(f"mixed_{i}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=search_worker) for _ in range(4)]
+        threads.append(threading.Thread(target=delete_worker))
+
+        for t in threads:
+            t.start()
+
+        # join with a timeout so a regression fails the test instead of
+        # hanging the whole suite
+        for t in threads:
+            t.join(timeout=30)
+        assert not any(t.is_alive() for t in threads), "deadlocked"
+
+        assert len(errors) == 0
+        assert fresh_store.count() == 10
+
 
 class TestErrorHandling:
     """Test error handling."""
     
-    def test_add_without_content(self):
+    def test_add_without_content(self, fresh_store):
         """Test error when adding document without content."""
-        store = DocumentStore()
-        
         # Should work with content
-        store.add("test1", "content", title="Title")
+        fresh_store.add("test1", "content", title="Title")
         
         # add() requires content parameter, so this test validates the API
         # The validation in add_batch is tested separately
     
-    def test_batch_add_missing_fields(self):
+    def test_batch_add_missing_fields(self, fresh_store):
         """Test batch add with missing required fields."""
-        store = DocumentStore()
-        
         docs = [
             {"id": "doc1"},  # Missing content
         ]
-        
+
         with pytest.raises(ValueError):
-            store.add_batch(docs)
+            fresh_store.add_batch(docs)
 
 
 class TestMemoryEfficiency:
@@ -506,20 +579,33 @@ class TestMemoryEfficiency:
             assert 'embedding' not in results[0]
     
     def test_streaming_memory(self, shared_store):
-        """Test streaming doesn't buffer all results."""
+        """Test streaming yields incrementally, not from a built list."""
         # Add multiple documents
         for i in range(10):
             shared_store.add(
                 doc_id=f"stream_mem_{i}",
                 content=f"Content {i}"
             )
-        
-        # Use streaming - should not buffer all results
-        count = 0
-        for result in shared_store.search_streaming("content", k=10):
-            count += 1
-            # Each result can be processed/freed immediately
-        
+
+        # Warm the query-embedding cache so the measurement below sees
+        # only iteration costs, not the one-off encode
+        shared_store.search("content", k=1)
+
+        # Must be a true generator: nothing materialized before iteration
+        stream = shared_store.search_streaming("content", k=10)
+        assert isinstance(stream, types.GeneratorType)
+
+        # Taking the first result should allocate one SearchResult plus
+        # iterator bookkeeping - not a Python-side list of all k results
+        tracemalloc.start()
+        first = next(stream)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert isinstance(first, SearchResult)
+        assert peak < 32 * 1024  # O(1) in k, not O(k) dicts/objects
+
+        count = 1 + sum(1 for _ in stream)
         assert count <= 10
 
 
@@ -14,17 +14,48 @@ Quick Start:
     ...     print(f"{result.title}: {result.score:.3f}")
 """
 
+import threading
+
 from .embeddings import TextEmbedder
 from .vector_store import VectorStoreWrapper
 from .sdk import DocumentStore, SDK
 from .search_result import SearchResult, StreamingSearchResult
 
+# Lazily-constructed shared embedder: loading Qwen3-Embedding-0.6B takes
+# seconds and hundreds of MB, so every DocumentStore() re-creating its own
+# copy is pure waste. One process-wide instance is safe - the embedder is
+# stateless apart from its read-only weights and LRU cache.
+_default_embedder = None
+_default_embedder_lock = threading.Lock()
+
+
+def get_default_embedder() -> TextEmbedder:
+    """
+    Return the process-wide shared TextEmbedder, creating it on first call.
+
+    The double-checked lock means the model is loaded exactly once even
+    when several threads construct DocumentStore instances concurrently.
+
+    Because the instance is shared process-wide, any mutation of its
+    configuration (device moves, cache settings) affects every store that
+    fell back to the default. Pass an explicit embedder to DocumentStore
+    when per-store configuration is needed.
+    """
+    global _default_embedder
+    if _default_embedder is None:
+        with _default_embedder_lock:
+            if _default_embedder is None:
+                _default_embedder = TextEmbedder()
+    return _default_embedder
+
+
 __all__ = [
     'TextEmbedder',
-    'VectorStoreWrapper', 
+    'VectorStoreWrapper',
     'DocumentStore',
     'SDK',
     'SearchResult',
-    'StreamingSearchResult'
+    'StreamingSearchResult',
+    'get_default_embedder'
 ]
 __version__ = '0.1.0'
@@ -0,0 +1,99 @@
+"""
+JIT-compiled numeric kernels for Python-side scoring.
+
+All hot-path scoring lives in the Rust extension, but Python-side numeric
+loops (rescoring candidates against raw vectors, cosine fallbacks) would
+otherwise run at interpreter speed. This module compiles them with Numba
+when it is installed - bytecode becomes LLVM machine code with SIMD
+autovectorization and a parallel outer loop - and falls back to vectorized
+numpy when it is not. Numba is an optional dependency: nothing here
+imports it at module level unconditionally.
+
+Callers should pass contiguous float32 arrays (np.ascontiguousarray(x,
+dtype=np.float32)); both backends accept anything array-like but only
+contiguous float32 hits the fast paths.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+
+    HAVE_NUMBA = True
+except ImportError:
+    numba = None
+    HAVE_NUMBA = False
+
+
+def _cosine_scores_numpy(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Vectorized numpy fallback for cosine_scores."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    norms = np.maximum(norms, 1e-12)
+    return (matrix @ query) / norms
+
+
+if HAVE_NUMBA:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _cosine_scores_jit(query, matrix):  # pragma: no cover - compiled
+        n, dim = matrix.shape
+        out = np.empty(n, dtype=np.float32)
+        q_norm = 0.0
+        for d in range(dim):
+            q_norm += query[d] * query[d]
+        q_norm = np.sqrt(q_norm)
+        for i in numba.prange(n):
+            dot = 0.0
+            row_norm = 0.0
+            for d in range(dim):
+                dot += matrix[i, d] * query[d]
+                row_norm += matrix[i, d] * matrix[i, d]
+            denom = np.sqrt(row_norm) * q_norm
+            out[i] = dot / denom if denom > 1e-12 else 0.0
+        return out
+
+
+def cosine_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity between one query and every row of a matrix.
+
+    Args:
+        query: Query vector, shape (dim,), float32
+        matrix: Candidate vectors, shape (n, dim), float32
+
+    Returns:
+        Array of n similarity scores, float32
+    """
+    if HAVE_NUMBA:
+        return _cosine_scores_jit(
+            np.ascontiguousarray(query, dtype=np.float32),
+            np.ascontiguousarray(matrix, dtype=np.float32),
+        )
+    return _cosine_scores_numpy(
+        np.asarray(query, dtype=np.float32), np.asarray(matrix, dtype=np.float32)
+    ).astype(np.float32)
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and scores of the k highest entries, sorted descending.
+
+    Uses argpartition (O(n)) to select before sorting only the k survivors,
+    instead of sorting all n scores.
+
+    Args:
+        scores: Score array, shape (n,)
+        k: Number of entries to keep
+
+    Returns:
+        (indices, scores) arrays of length min(k, n), best first
+    """
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    part = np.argpartition(scores, -k)[-k:]
+    order = np.argsort(scores[part])[::-1]
+    idx = part[order]
+    return idx, scores[idx]
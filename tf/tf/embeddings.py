@@ -2,12 +2,51 @@
 Embeddings module for text vectorization using Qwen3-Embedding model.
 """
 
+import functools
+import hashlib
+import logging
+import os
+import warnings
+
+# Let the fast tokenizer spread batch tokenization across CPU cores - it
+# releases the GIL and fans out via Rayon internally, so whole-list calls
+# below overlap preprocessing with GPU compute. Must be set before the
+# transformers import, which reads it once; setdefault respects an
+# explicit user override.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
 import torch
 from transformers import AutoTokenizer, AutoModel
 from typing import List, Union
 import numpy as np
 
 
+logger = logging.getLogger(__name__)
+
+# Model names this process has already pulled through the Hub once.
+# Later TextEmbedder constructions for the same model can skip the
+# update-check HEAD requests entirely (1-3s of network RTT each).
+_HUB_VERIFIED = set()
+
+
+def _pool_and_normalize(hidden: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    """
+    Masked mean pooling followed by L2 normalization, in one graph.
+
+    Written as a free function so torch.compile can fuse the upcast, mask
+    multiply, sum, divide, and norm into a single kernel - eager mode
+    reads the (B, L, D) hidden states from memory three to four times,
+    the fused kernel once. The mask stays (B, L, 1) and broadcasts in the
+    multiply (never .expand()ed to (B, L, D)), and the fp32 upcast of the
+    half-precision hidden states happens inside the reduction rather than
+    as a separately materialized float32 copy.
+    """
+    mask = attention_mask.unsqueeze(-1).to(torch.float32)
+    summed = torch.sum(hidden.to(torch.float32) * mask, dim=1)
+    counts = torch.clamp(mask.sum(dim=1), min=1e-9)
+    return torch.nn.functional.normalize(summed / counts, p=2, dim=1)
+
+
 class TextEmbedder:
     """
     Text embedder using Qwen3/Qwen3-Embedding-0.6B model.
@@ -16,104 +55,524 @@ class TextEmbedder:
     that can be used with the Rust vector store.
     """
     
-    def __init__(self, model_name: str = "Qwen/Qwen3-Embedding-0.6B", device: str = None):
+    def __init__(
+        self,
+        model_name: str = "Qwen/Qwen3-Embedding-0.6B",
+        device: str = None,
+        backend: str = "torch",
+        multi_gpu: bool = False,
+        cache_dir: str = None,
+        revision: str = None,
+        local_files_only: bool = None,
+        verbose: bool = False
+    ):
         """
         Initialize the text embedder.
-        
+
         Args:
             model_name: HuggingFace model name (default: Qwen/Qwen3-Embedding-0.6B)
             device: Device to use ('cuda', 'cpu', or None for auto-detect)
+            multi_gpu: Shard each forward pass across all visible GPUs
+                       with DataParallel. Near-linear speedup for bulk
+                       indexing batches (embed_batch); leave off for
+                       query workloads, where the per-call scatter/gather
+                       costs more than it saves
+            backend: Inference engine - 'torch' (default), 'onnx' (ONNX
+                     Runtime, fused kernels and no eager-mode framework
+                     overhead), or 'trt' (ONNX Runtime on TensorRT). The
+                     ONNX backends need the optional optimum[onnxruntime]
+                     dependency; the exported graph is cached on disk so
+                     only the first startup pays for the export
+            cache_dir: Directory for a persistent embedding cache keyed by
+                       sha256(model_name, text). Embeddings are pure
+                       functions of that pair, so cache hits skip the model
+                       entirely across processes and runs; entries are
+                       stored fp16 (half the bytes, negligible cosine
+                       error on unit-norm vectors). None disables caching
+            revision: Pin the model to a specific Hub revision (tag,
+                      branch, or commit) for reproducible loads
+            local_files_only: Skip all Hub requests and load straight from
+                              the local cache. Defaults to True once this
+                              process has loaded the model before, False on
+                              the first load
+            verbose: Also print load progress to stdout. Off by default -
+                     unconditional prints serialize parallel test workers
+                     on stdout capture and pollute the pytest buffer;
+                     loading is always reported via logging either way
         """
         if device is None:
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
         else:
             self.device = device
-            
-        print(f"Loading model {model_name} on {self.device}...")
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
-        self.model = AutoModel.from_pretrained(model_name, trust_remote_code=True)
-        self.model.to(self.device)
-        self.model.eval()
-        
+
+        self.backend = backend
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        # Hub kwargs shared by the tokenizer and model loads. Once the
+        # files are cached locally, the update-check round trips on every
+        # process start are pure overhead.
+        if local_files_only is None:
+            local_files_only = model_name in _HUB_VERIFIED
+        hub_kwargs = {"local_files_only": local_files_only}
+        if revision is not None:
+            hub_kwargs["revision"] = revision
+
+        logger.info("Loading model %s on %s (backend=%s)...", model_name, self.device, backend)
+        if verbose:
+            print(f"Loading model {model_name} on {self.device} (backend={backend})...")
+        # use_fast selects the Rust tokenizer - an order of magnitude faster
+        # than the Python implementation on long batches
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            model_name, trust_remote_code=True, use_fast=True, **hub_kwargs
+        )
+        if backend == "torch":
+            # Half precision on GPU doubles tensor-core throughput and halves
+            # activation memory (bf16 preferred, fp16 on older cards); the CPU
+            # path stays fp32 - emulated bf16 matmuls are slower than fp32
+            # there. Pooling upcasts to float32 below either way.
+            if self.device == "cuda":
+                self.dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            else:
+                self.dtype = torch.float32
+            # Fused attention: one kernel instead of eager's materialized
+            # (L, L) score matrix - attention at max_length=512 is bound on
+            # HBM traffic, not FLOPs. flash_attention_2 where installed and
+            # the GPU is Ampere or newer, otherwise torch SDPA.
+            attn_implementation = "sdpa"
+            if self.device == "cuda" and torch.cuda.get_device_capability()[0] >= 8:
+                try:
+                    import flash_attn  # noqa: F401
+                    attn_implementation = "flash_attention_2"
+                except ImportError:
+                    pass
+            try:
+                self.model = AutoModel.from_pretrained(
+                    model_name,
+                    trust_remote_code=True,
+                    torch_dtype=self.dtype,
+                    attn_implementation=attn_implementation,
+                    **hub_kwargs
+                )
+            except ValueError:
+                # Model classes that predate the attn_implementation switch
+                # keep their default attention
+                self.model = AutoModel.from_pretrained(
+                    model_name,
+                    trust_remote_code=True,
+                    torch_dtype=self.dtype,
+                    **hub_kwargs
+                )
+            self.model.to(self.device)
+            self.model.eval()
+            if self.device == "cuda":
+                # reduce-overhead wraps each encountered (batch, seq_len)
+                # shape in a captured CUDA graph and replays it: one launch
+                # for the whole forward instead of per-kernel driver round
+                # trips. Shape buckets stay few because tokenization below
+                # pads lengths to multiples of 8.
+                if hasattr(torch, "compile"):
+                    try:
+                        self.model = torch.compile(self.model, mode="reduce-overhead")
+                    except Exception:
+                        pass
+            elif self.device == "cpu":
+                # Eager fp32 on CPU leaves cores idle and kernels unfused.
+                # Use every core for intra-op parallelism (launchers often
+                # default lower), and compile the forward so inductor emits
+                # fused oneDNN kernels; dynamic=True re-specializes per
+                # shape bucket instead of recompiling every batch size.
+                torch.set_num_threads(os.cpu_count() or 1)
+                if hasattr(torch, "compile"):
+                    try:
+                        self.model = torch.compile(self.model, dynamic=True)
+                    except Exception:
+                        pass
+        elif backend in ("onnx", "trt"):
+            self.dtype = torch.float32
+            self.model = self._load_onnx(model_name, backend)
+            # ONNX Runtime owns device placement internally; feed CPU tensors
+            self.device = "cpu"
+        else:
+            raise ValueError(f"Unknown backend: {backend!r} (expected 'torch', 'onnx' or 'trt')")
+
+        # The files are in the local cache now; later loads in this process
+        # can skip the Hub round trips
+        _HUB_VERIFIED.add(model_name)
+
         # Get embedding dimension from model
         self.dimension = self.model.config.hidden_size
-        print(f"Model loaded. Embedding dimension: {self.dimension}")
-    
-    def encode(self, texts: Union[str, List[str]], batch_size: int = 32) -> Union[List[float], List[List[float]]]:
+        logger.info("Model loaded. Embedding dimension: %d", self.dimension)
+        if verbose:
+            print(f"Model loaded. Embedding dimension: {self.dimension}")
+
+        # One replica per GPU: each forward scatters the batch across the
+        # replicas and gathers the hidden states on device 0, so the big
+        # length-bucketed indexing batches scale near-linearly in GPU count.
+        # (Wrapped after the config read above - DataParallel does not
+        # forward arbitrary attribute access to the inner module.)
+        if backend == "torch" and multi_gpu and self.device == "cuda" \
+                and torch.cuda.device_count() > 1:
+            self.model = torch.nn.DataParallel(self.model)
+
+        # Fuse pooling + normalize into one compiled kernel where the
+        # toolchain supports it; eager fallback keeps behavior identical
+        if hasattr(torch, "compile"):
+            try:
+                self._pool = torch.compile(
+                    _pool_and_normalize, mode="reduce-overhead", fullgraph=True
+                )
+            except Exception:
+                self._pool = _pool_and_normalize
+        else:
+            self._pool = _pool_and_normalize
+
+        # Per-instance LRU cache for single-text encodes: repeated queries
+        # skip the transformer forward entirely. Tuples keep cached entries
+        # immutable so callers can't corrupt the cache.
+        self._encode_cache = functools.lru_cache(maxsize=4096)(self._encode_tuple)
+
+    def _load_onnx(self, model_name: str, backend: str):
+        """
+        Load the model through ONNX Runtime, exporting it on first use.
+
+        The exported graph is written to ~/.cache/tf/onnx/<model> so later
+        startups load it directly instead of re-exporting. backend='trt'
+        selects the TensorRT execution provider; 'onnx' uses CUDA when
+        available, falling back to the CPU provider.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+        except ImportError as e:
+            raise ImportError(
+                "backend='onnx'/'trt' requires the optional dependency "
+                "optimum[onnxruntime] (pip install optimum[onnxruntime-gpu])"
+            ) from e
+
+        if backend == "trt":
+            provider = "TensorrtExecutionProvider"
+        elif torch.cuda.is_available():
+            provider = "CUDAExecutionProvider"
+        else:
+            provider = "CPUExecutionProvider"
+
+        cache_dir = os.path.join(
+            os.path.expanduser("~"), ".cache", "tf", "onnx",
+            model_name.replace("/", "--")
+        )
+        if os.path.isdir(cache_dir):
+            return ORTModelForFeatureExtraction.from_pretrained(cache_dir, provider=provider)
+
+        model = ORTModelForFeatureExtraction.from_pretrained(
+            model_name, export=True, provider=provider
+        )
+        model.save_pretrained(cache_dir)
+        return model
+
+    def encode(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: int = 32,
+        quantize: str = "none"
+    ) -> Union[np.ndarray, tuple]:
         """
         Encode text(s) into vector embeddings.
-        
+
+        List inputs are length-bucketed: texts are tokenized once without
+        padding to get exact token counts, sorted so each batch holds
+        similar-length sequences, and every batch is padded only to its own
+        longest member. On mixed-length corpora this avoids most of the
+        padding-token FLOPs that fixed-order batches waste.
+
         Args:
             texts: Single text string or list of text strings
             batch_size: Batch size for processing multiple texts
-            
+            quantize: 'none' (default) returns float embeddings; 'int8'
+                      returns symmetric per-vector int8 codes plus their
+                      dequantization scales - a 4x smaller representation
+                      that pairs with the store's int8 flat index
+
         Returns:
-            Single embedding (List[float]) if input is a string,
-            or list of embeddings (List[List[float]]) if input is a list
+            quantize='none': a 1-D float32 array for a string input, or an
+            (N, D) float32 array for a list input. Arrays pass into the
+            Rust store zero-copy via the buffer protocol; .tolist() would
+            box every element as a Python float object.
+            quantize='int8': tuple (codes, scale) - for a string input a
+            1-D int8 array and a float scale; for a list input an (N, D)
+            int8 array and an (N,) float32 array of scales
         """
-        # Handle single text input
+        if quantize not in ("none", "int8"):
+            raise ValueError(f"Unknown quantize mode: {quantize!r} (expected 'none' or 'int8')")
+
+        # Fast path: single text, no bucketing bookkeeping
         if isinstance(texts, str):
-            texts = [texts]
-            single_input = True
+            embedding = self._cache_get(texts) if self.cache_dir is not None else None
+            if embedding is None:
+                embedding = self._encode_group([texts])[0]
+                if self.cache_dir is not None:
+                    self._cache_put(texts, embedding)
+            if quantize == "int8":
+                q, scales = self._quantize_int8(embedding)
+                return q, float(scales)
+            return embedding
+
+        if not texts:
+            if quantize == "int8":
+                return (np.empty((0, self.dimension), dtype=np.int8),
+                        np.empty(0, dtype=np.float32))
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        if self.cache_dir is None:
+            all_embeddings = self._encode_list(texts, batch_size)
         else:
-            single_input = False
-        
-        all_embeddings = []
-        
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
-            
-            # Tokenize
+            # Serve disk hits directly; only cache misses see the model
+            all_embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+            misses = []
+            for i, text in enumerate(texts):
+                hit = self._cache_get(text)
+                if hit is None:
+                    misses.append(i)
+                else:
+                    all_embeddings[i] = hit
+            if misses:
+                fresh = self._encode_list([texts[i] for i in misses], batch_size)
+                for i, row in zip(misses, fresh):
+                    all_embeddings[i] = row
+                    self._cache_put(texts[i], row)
+
+        if quantize == "int8":
+            return self._quantize_int8(all_embeddings)
+        return all_embeddings
+
+    def _encode_list(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Length-bucketed batch encode; returns (N, D) float32 in input order."""
+        # Exact token lengths from one unpadded pass through the fast
+        # tokenizer (cheap - no tensors, no padding)
+        encoded = self.tokenizer(texts, padding=False, truncation=True, max_length=512)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+
+        # Batch similar-length texts together, scatter back to input order
+        all_embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            group = order[start:start + batch_size]
+            all_embeddings[group] = self._encode_group([texts[i] for i in group])
+
+        return all_embeddings
+
+    def _cache_path(self, text: str) -> str:
+        """Content-addressed cache file for (model_name, text)."""
+        digest = hashlib.sha256(
+            (self.model_name + "\x00" + text).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".npy")
+
+    def _cache_get(self, text: str):
+        """Return the cached embedding as float32, or None on a miss."""
+        try:
+            return np.load(self._cache_path(text)).astype(np.float32)
+        except (OSError, ValueError):
+            return None
+
+    def _cache_put(self, text: str, embedding: np.ndarray) -> None:
+        """Persist an embedding (fp16); atomic rename keeps readers safe."""
+        path = self._cache_path(text)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            # Write through a file object - np.save would otherwise append
+            # .npy to the tmp name and break the rename
+            with open(tmp, "wb") as f:
+                np.save(f, embedding.astype(np.float16))
+            os.replace(tmp, path)
+        except OSError:
+            # Cache writes are best-effort; a full disk must not fail encode
+            pass
+
+    @staticmethod
+    def _quantize_int8(embeddings: np.ndarray) -> tuple:
+        """
+        Symmetric per-vector int8 quantization.
+
+        Uses the same convention as the Rust store's quantize_i8:
+        scale = max|x| / 127, codes = round(x / scale) clamped to
+        [-127, 127], so dequantization is codes * scale. Vectors are
+        unit-norm, so the per-vector scale costs 4 bytes and recovers
+        the small accuracy loss a single global scale would leave.
+        """
+        scales = np.abs(embeddings).max(axis=-1, keepdims=True) / 127.0
+        safe = np.where(scales == 0.0, 1.0, scales)
+        codes = np.clip(np.round(embeddings / safe), -127, 127).astype(np.int8)
+        return codes, scales.squeeze(-1).astype(np.float32)
+
+    def _forward(self, inputs):
+        """Run the model forward, under autocast on CUDA."""
+        if self.device == "cuda":
+            with torch.autocast("cuda", dtype=self.dtype):
+                return self.model(**inputs)
+        return self.model(**inputs)
+
+    def _encode_group(self, batch_texts: List[str]) -> np.ndarray:
+        """Tokenize (padding to the batch max), forward, pool, normalize."""
+        inputs = self.tokenizer(
+            batch_texts,
+            padding=True,
+            truncation=True,
+            max_length=512,
+            # Multiple-of-8 lengths collapse nearby batch shapes into the
+            # same CUDA-graph bucket (and suit tensor cores); harmless on CPU
+            pad_to_multiple_of=8,
+            return_tensors="pt"
+        ).to(self.device)
+
+        # inference_mode is strictly cheaper than no_grad: it also skips
+        # autograd view/version tracking on every intermediate tensor
+        with torch.inference_mode():
+            outputs = self._forward(inputs)
+            # _pool upcasts to float32 inside its fused graph, so pooling
+            # and L2 norm stay numerically safe without an eager fp32 copy
+            embeddings = self._pool(outputs.last_hidden_state, inputs['attention_mask'])
+
+        # Return the numpy matrix directly: .tolist() would box every
+        # element as a 28-byte Python float; the Rust store takes the
+        # array through the buffer protocol without that detour
+        return self._to_cpu(embeddings).numpy()
+
+    def _to_cpu(self, embeddings: torch.Tensor) -> torch.Tensor:
+        """
+        Move embeddings to the CPU, via a pinned staging buffer on CUDA.
+
+        Pinned (page-locked) memory lets the copy run as true async DMA
+        instead of a staged pageable transfer; the single synchronize fences
+        the batch once rather than per element.
+        """
+        if self.device == "cuda":
+            out = torch.empty(embeddings.shape, dtype=embeddings.dtype, pin_memory=True)
+            out.copy_(embeddings, non_blocking=True)
+            torch.cuda.synchronize()
+            return out
+        return embeddings
+    
+    def embed_batch(self, texts: List[str], max_batch_tokens: int = 65536) -> np.ndarray:
+        """
+        Embed a batch of texts with length-sorted, padding-minimal batching.
+
+        Texts are sorted by estimated token length, then grouped into
+        micro-batches whose padded size (batch rows x longest sequence in
+        the group) stays under max_batch_tokens. Sorting puts similar-length
+        texts together so padding to the group maximum wastes few tokens;
+        the cap bounds peak activation memory for large or skewed corpora.
+        The original input order is restored in the returned array.
+
+        Args:
+            texts: List of text strings to embed
+            max_batch_tokens: Upper bound on padded tokens per forward pass
+
+        Returns:
+            Numpy array of shape (len(texts), dimension), dtype float32,
+            rows in the same order as the input texts
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        # Sort by a cheap token-length estimate (~4 chars/token, capped at
+        # the truncation limit); exact counts would mean tokenizing twice
+        est_tokens = [min(len(t) // 4 + 1, 512) for t in texts]
+        order = sorted(range(len(texts)), key=est_tokens.__getitem__)
+
+        # Greedily group sorted texts: texts are ascending in length, so a
+        # group's padded cost is its size times the LAST member's estimate
+        groups = []
+        group_start = 0
+        for i in range(1, len(order) + 1):
+            at_end = i == len(order)
+            if at_end or (i - group_start + 1) * est_tokens[order[i]] > max_batch_tokens:
+                groups.append(order[group_start:i])
+                group_start = i
+
+        # Pre-allocated output: each group's rows are scattered straight to
+        # their final positions, so peak memory is the output array plus ONE
+        # group's activations - no per-group chunk list, no final concatenate
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for group in groups:
+            # Dynamic padding only to the longest sequence in this group
             inputs = self.tokenizer(
-                batch_texts,
+                [texts[i] for i in group],
                 padding=True,
                 truncation=True,
                 max_length=512,
+                # Same multiple-of-8 bucketing as _encode_group
+                pad_to_multiple_of=8,
                 return_tensors="pt"
             ).to(self.device)
-            
-            # Generate embeddings
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                # Use mean pooling on the last hidden state
-                embeddings = self._mean_pooling(outputs.last_hidden_state, inputs['attention_mask'])
-                # Normalize embeddings
-                embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
-            
-            # Convert to list of floats
-            batch_embeddings = embeddings.cpu().numpy().tolist()
-            all_embeddings.extend(batch_embeddings)
-        
-        # Return single embedding if single input
-        if single_input:
-            return all_embeddings[0]
-        
-        return all_embeddings
-    
-    def _mean_pooling(self, hidden_states: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+
+            with torch.inference_mode():
+                outputs = self._forward(inputs)
+                # _pool handles the fp32 upcast inside its fused graph
+                embeddings = self._pool(outputs.last_hidden_state, inputs['attention_mask'])
+
+            out[group] = self._to_cpu(embeddings).numpy()
+
+        return out
+
+    def encode_stream(self, texts: List[str], batch_size: int = 32):
         """
-        Perform mean pooling on hidden states.
-        
+        Yield embeddings one batch at a time without accumulating them.
+
+        For embed-index-drop pipelines over large corpora: each yielded
+        (B, D) float32 array can be pushed to the store and released before
+        the next batch is computed, keeping peak memory at one batch
+        regardless of corpus size. Batches follow the input order (no
+        length bucketing) so callers can zip yielded rows with their texts.
+
         Args:
-            hidden_states: Model output hidden states
-            attention_mask: Attention mask from tokenizer
-            
+            texts: List of text strings to embed
+            batch_size: Number of texts per yielded batch
+
+        Yields:
+            (B, D) float32 arrays, B <= batch_size, in input order
+        """
+        for start in range(0, len(texts), batch_size):
+            yield self._encode_group(texts[start:start + batch_size])
+
+    def encode_one(self, text: str) -> np.ndarray:
+        """
+        Encode a single text, guaranteed flat (D,) float32 contiguous.
+
+        The typed contract for hot-path glue code: callers can hand the
+        result straight to the Rust store via the buffer protocol without
+        any shape or type introspection. Served through the LRU cache, so
+        repeated texts (typically search queries) skip the model.
+
+        Args:
+            text: Text to encode
+
         Returns:
-            Pooled embeddings
+            C-contiguous float32 array of shape (dimension,)
         """
-        # Expand attention mask to match hidden states shape
-        input_mask_expanded = attention_mask.unsqueeze(-1).expand(hidden_states.size()).float()
-        
-        # Sum hidden states with mask
-        sum_embeddings = torch.sum(hidden_states * input_mask_expanded, dim=1)
-        
-        # Sum mask (to get proper denominator for mean)
-        sum_mask = torch.clamp(input_mask_expanded.sum(dim=1), min=1e-9)
-        
-        # Calculate mean
-        return sum_embeddings / sum_mask
-    
+        return np.asarray(self._encode_cache(text), dtype=np.float32)
+
+    def _encode_tuple(self, text: str) -> tuple:
+        """Encode one text and return an immutable tuple (cache storage form)."""
+        return tuple(self.encode(text).tolist())
+
+    def encode_cached(self, text: str) -> List[float]:
+        """
+        Encode a single text with LRU caching.
+
+        Repeated identical texts (e.g. the same search query issued many
+        times) hit the cache and skip tokenization and the model forward
+        entirely. The cache holds up to 4096 entries per embedder.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            List of floats representing the embedding
+        """
+        return list(self._encode_cache(text))
+
     def get_dimension(self) -> int:
         """
         Get the dimension of the embeddings.
@@ -123,16 +582,42 @@ class TextEmbedder:
         """
         return self.dimension
     
+    def encode_batch_callback(self, texts: List[str]) -> np.ndarray:
+        """
+        Batched callback function for Rust integration.
+
+        One crossing of the FFI boundary embeds a whole buffer of texts:
+        a single GIL acquisition and one batched forward pass instead of
+        per-text calls each launching a batch-of-1 kernel. Prefer this over
+        encode_callback whenever the caller can accumulate texts.
+
+        Args:
+            texts: List of texts to encode
+
+        Returns:
+            List of embeddings, one per input text, in input order
+        """
+        return self.encode(texts)
+
     def encode_callback(self, text: str) -> List[float]:
         """
-        Callback function for Rust integration.
-        
-        This function is designed to be called from Rust to get embeddings.
-        
+        Per-text callback function for Rust integration.
+
+        .. deprecated::
+            Each call crosses PyO3, re-takes the GIL, and runs a batch-of-1
+            forward pass. Use encode_batch_callback with accumulated texts
+            instead; this remains only for backward compatibility.
+
         Args:
             text: Text to encode
-            
+
         Returns:
             List of floats representing the embedding
         """
+        warnings.warn(
+            "encode_callback is deprecated; accumulate texts and use "
+            "encode_batch_callback instead",
+            DeprecationWarning,
+            stacklevel=2
+        )
         return self.encode(text)
@@ -11,11 +11,18 @@ This module provides a clean SDK interface for document management with full CRU
 All operations are thread-safe and memory-efficient.
 """
 
-from typing import List, Dict, Optional, Any, Iterator, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Literal, Optional, Any, Iterator, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import queue
+import sqlite3
 import threading
+import numpy as np
 from .embeddings import TextEmbedder
 from .search_result import SearchResult
+from ._fast import top_k
 
 
 class DocumentStore:
@@ -34,18 +41,82 @@ class DocumentStore:
     - Thread-safe: concurrent operations supported
     - Batch operations: parallel processing for bulk operations
     """
-    
-    def __init__(self, embedder: TextEmbedder = None, dimension: Optional[int] = None):
+
+    # Fixed attribute layout: slot loads skip the per-instance __dict__
+    # hash lookup on every hot-path attribute access, and instances drop
+    # the dict allocation entirely
+    __slots__ = (
+        'embedder', '_store', '_executor',
+        '_emb_cache', '_emb_cache_lock',
+        '_db', '_db_lock', '_emb_key_prefix',
+        '_lsh', '_minhash_cls', '_lsh_vectors', '_lsh_lock', '_lsh_counter',
+        '_dimension',
+        '_query_cache', '_query_cache_results', '_query_cache_lock',
+        '_query_cache_counter',
+        '_search_columns', '_search_iter', '_set_vector', '_get', '_rm',
+    )
+
+    def __init__(
+        self,
+        embedder: TextEmbedder = None,
+        dimension: Optional[int] = None,
+        near_duplicate_reuse: bool = False,
+        quantization: str = 'f32',
+        cache_path: Optional[str] = None,
+        semantic_query_cache: bool = False,
+        max_workers: Optional[int] = None,
+        embedder_kind: Literal['local', 'api'] = 'local'
+    ):
         """
         Initialize the document store.
-        
+
         Args:
-            embedder: TextEmbedder instance (created if None)
+            embedder: TextEmbedder instance (the process-wide shared
+                      embedder from get_default_embedder() is used if None,
+                      so multiple stores never re-load the model)
             dimension: Vector dimension (auto-detected from embedder if None)
+            near_duplicate_reuse: Reuse the embedding of a previously added
+                                  near-duplicate (MinHash Jaccard > 0.95
+                                  over 5-shingles) instead of re-embedding.
+                                  Typo-level edits then skip the model at
+                                  the cost of an approximate vector.
+                                  Requires the optional 'datasketch'
+                                  dependency
+            quantization: 'f32' (default) stores full-precision vectors;
+                          'sq8' stores symmetric int8 codes - 4x less
+                          memory and bandwidth per vector, typically <1%
+                          recall loss. Queries are quantized the same way
+                          inside the store at search time
+            cache_path: SQLite file persisting the embedding cache across
+                        process restarts. Embeddings computed by add() and
+                        search() are written through to it, and the
+                        in-memory LRU is warmed from it on startup, so a
+                        second run over the same corpus skips the model
+                        almost entirely. Keys include the model name and
+                        dimension, so different models can safely share
+                        one file
+            semantic_query_cache: Serve search() results for queries that
+                                  are semantically equivalent (cosine >=
+                                  0.97) to a recently seen query from a
+                                  small ANN cache of query vectors, skipping
+                                  the main index scan. The cache is cleared
+                                  on every write, so results never go stale.
+                                  Off by default because near-equivalent is
+                                  not identical - rankings may differ
+                                  slightly from an uncached search
+            max_workers: Thread-pool size for parallel operations. Defaults
+                         per embedder_kind: 2 for 'local' (more threads
+                         just contend for the one model/device) and
+                         min(32, cpu_count + 4) for 'api' (threads mostly
+                         wait on the network, so oversubscribe)
+            embedder_kind: 'local' for an in-process model (default) or
+                           'api' for a network-backed embedder; only used
+                           to pick the max_workers default
         """
-        # Initialize embedder
+        # Initialize embedder - fall back to the lazy shared singleton
         if embedder is None:
-            self.embedder = TextEmbedder()
+            from . import get_default_embedder
+            self.embedder = get_default_embedder()
         else:
             self.embedder = embedder
         
@@ -56,16 +127,219 @@ class DocumentStore:
         # Initialize Rust store
         try:
             from tf_rust import VectorStore
-            self._store = VectorStore(dimension)
         except ImportError as e:
             raise ImportError(
                 "Failed to import tf_rust module. "
                 "Please build the Rust extension first using 'maturin develop'."
             ) from e
-        
-        # Thread pool for parallel operations
-        self._executor = ThreadPoolExecutor(max_workers=4)
-        self._lock = threading.Lock()
+
+        self._dimension = dimension
+        if quantization == 'f32':
+            self._store = VectorStore(dimension)
+        elif quantization == 'sq8':
+            # Scalar-quantized flat index: int8 codes + per-vector scale,
+            # SIMD int8 dot products during the scan
+            self._store = VectorStore.new_flat_i8(dimension)
+        else:
+            raise ValueError(
+                f"Unknown quantization: {quantization!r} (expected 'f32' or 'sq8')"
+            )
+
+        # Pre-bound store methods: the descriptor lookup happens once here
+        # instead of on every call. Matters on tiny-k searches where Python
+        # call overhead rivals the Rust compute.
+        self._search_columns = self._store.search_columns
+        self._search_iter = self._store.search_iter
+        self._set_vector = self._store.set_vector
+        self._get = self._store.get
+        self._rm = self._store.rm
+        
+        # Thread pool for parallel operations. No Python-side store mutex:
+        # the Rust VectorStore serializes writers (and admits concurrent
+        # readers) with its own RwLock, so a second lock here would only
+        # re-serialize what the extension already handles. This depends on
+        # an invariant the extension maintains: no Rust method holds a lock
+        # guard while (re-)acquiring the GIL, otherwise mixed search+delete
+        # traffic from this pool can deadlock the interpreter (covered by
+        # test_concurrent_search_and_delete). Sizing follows
+        # the embedder: local models serialize on the device anyway, so a
+        # wide pool only adds contention; API embedders block on network
+        # I/O, so oversubscription is the point.
+        if max_workers is None:
+            if embedder_kind == 'api':
+                max_workers = min(32, (os.cpu_count() or 1) + 4)
+            else:
+                max_workers = 2
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        # Content-hash LRU embedding cache: duplicate chunks and repeated
+        # queries skip the model entirely. Keys are 16-byte blake2b digests
+        # rather than the texts themselves, so the cache holds ~dim*4 bytes
+        # per entry no matter how long the content was.
+        self._emb_cache = OrderedDict()
+        self._emb_cache_lock = threading.Lock()
+
+        # Cache keys are salted with model name + dimension so a store
+        # opened against a different model never reads foreign vectors
+        self._emb_key_prefix = (
+            f"{getattr(self.embedder, 'model_name', '')}:{dimension}\x00".encode('utf-8')
+        )
+
+        # Optional persistent tier under the in-memory LRU: a tiny SQLite
+        # table of (key hash -> raw float32 bytes). Write-through on every
+        # model call; warmed into the LRU at startup so repeat runs over
+        # the same corpus are I/O-bound instead of compute-bound.
+        self._db = None
+        self._db_lock = threading.Lock()
+        if cache_path is not None:
+            self._db = sqlite3.connect(cache_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS emb (h BLOB PRIMARY KEY, v BLOB)")
+            self._db.commit()
+            # Most recently inserted rows first - newest corpus wins the LRU
+            rows = self._db.execute(
+                "SELECT h, v FROM emb ORDER BY rowid DESC LIMIT ?",
+                (self._EMB_CACHE_SIZE,),
+            ).fetchall()
+            for key, blob in reversed(rows):
+                self._emb_cache[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+
+        # Optional semantic query cache: a second, tiny VectorStore over
+        # recent query vectors. A new query first probes it; a near-enough
+        # neighbour (cosine >= 0.97) hands back that query's result columns
+        # without touching the main index. Flat-backed, not HNSW: flat
+        # removals are physical, so LRU eviction actually frees the vector
+        # instead of tombstoning it and growing the graph forever
+        self._query_cache = None
+        if semantic_query_cache:
+            self._query_cache = VectorStore.new_flat(dimension)
+            self._query_cache_results = OrderedDict()
+            self._query_cache_lock = threading.Lock()
+            self._query_cache_counter = 0
+
+        # Optional MinHash LSH over recently added contents: lets add()
+        # reuse the embedding of a near-duplicate instead of re-embedding
+        self._lsh = None
+        if near_duplicate_reuse:
+            try:
+                from datasketch import MinHash, MinHashLSH
+            except ImportError as e:
+                raise ImportError(
+                    "near_duplicate_reuse requires the optional "
+                    "'datasketch' dependency (pip install datasketch)"
+                ) from e
+            self._minhash_cls = MinHash
+            self._lsh = MinHashLSH(threshold=0.95, num_perm=64)
+            self._lsh_vectors: Dict[int, Any] = {}
+            self._lsh_lock = threading.Lock()
+            self._lsh_counter = 0
+
+    _EMB_CACHE_SIZE = 10000
+    _QUERY_CACHE_SIZE = 1000
+    _QUERY_CACHE_THRESHOLD = 0.97
+
+    def _query_cache_get(self, vector, k: int):
+        """Return cached columns for a near-identical query, or None."""
+        with self._query_cache_lock:
+            if not self._query_cache_results:
+                return None
+            best = self._query_cache.search(vector, 1)
+            if not best or best[0].score < self._QUERY_CACHE_THRESHOLD:
+                return None
+            entry = self._query_cache_results.get(best[0].id)
+            if entry is None:
+                return None
+            cached_k, columns = entry
+        if cached_k == k:
+            return columns
+        if cached_k > k:
+            ids, scores, titles, urls, summaries = columns
+            return (ids[:k], scores[:k], titles[:k], urls[:k], summaries[:k])
+        # Cached entry holds fewer hits than requested - not reusable
+        return None
+
+    def _query_cache_put(self, vector, k: int, columns) -> None:
+        """Remember a query vector and its result columns for reuse."""
+        with self._query_cache_lock:
+            key = str(self._query_cache_counter)
+            self._query_cache_counter += 1
+            self._query_cache.set_vector(key, vector, '', '', '')
+            self._query_cache_results[key] = (k, columns)
+            while len(self._query_cache_results) > self._QUERY_CACHE_SIZE:
+                old_key, _ = self._query_cache_results.popitem(last=False)
+                self._query_cache.rm(old_key)
+
+    def _query_cache_clear(self) -> None:
+        """Drop all cached query results (called on every write)."""
+        if self._query_cache is None:
+            return
+        with self._query_cache_lock:
+            # Cheaper to rebuild the tiny store than to remove each entry
+            from tf_rust import VectorStore
+            self._query_cache = VectorStore.new_flat(self._dimension)
+            self._query_cache_results.clear()
+
+    def _minhash(self, content: str):
+        """MinHash signature over the content's 5-character shingles."""
+        shingles = {content[i:i + 5] for i in range(len(content) - 4)} or {content}
+        mh = self._minhash_cls(num_perm=64)
+        mh.update_batch([s.encode('utf-8') for s in shingles])
+        return mh
+
+    def _near_duplicate_vector(self, mh):
+        """Return a stored near-duplicate's embedding, or None."""
+        with self._lsh_lock:
+            for key in self._lsh.query(mh):
+                return self._lsh_vectors[key]
+        return None
+
+    def _remember_signature(self, mh, vector) -> None:
+        """Register a freshly embedded content for future near-dup reuse."""
+        with self._lsh_lock:
+            key = self._lsh_counter
+            self._lsh_counter += 1
+            self._lsh.insert(key, mh)
+            self._lsh_vectors[key] = vector
+
+    def _encode_cached(self, text: str):
+        """Embed text, serving repeats from the content-hash LRU cache."""
+        key = hashlib.blake2b(
+            self._emb_key_prefix + text.encode('utf-8'), digest_size=16
+        ).digest()
+        with self._emb_cache_lock:
+            vector = self._emb_cache.get(key)
+            if vector is not None:
+                self._emb_cache.move_to_end(key)
+                return vector
+
+        # LRU miss: try the persistent tier before paying for a forward pass
+        if self._db is not None:
+            with self._db_lock:
+                row = self._db.execute("SELECT v FROM emb WHERE h = ?", (key,)).fetchone()
+            if row is not None:
+                vector = np.frombuffer(row[0], dtype=np.float32)
+                with self._emb_cache_lock:
+                    self._emb_cache[key] = vector
+                    while len(self._emb_cache) > self._EMB_CACHE_SIZE:
+                        self._emb_cache.popitem(last=False)
+                return vector
+
+        # Full miss: run the model outside the cache lock
+        vector = self.embedder.encode(text)
+
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO emb (h, v) VALUES (?, ?)",
+                    (key, vector.tobytes()),
+                )
+                self._db.commit()
+
+        with self._emb_cache_lock:
+            self._emb_cache[key] = vector
+            self._emb_cache.move_to_end(key)
+            while len(self._emb_cache) > self._EMB_CACHE_SIZE:
+                self._emb_cache.popitem(last=False)
+        return vector
     
     def add(
         self,
@@ -80,7 +354,12 @@ class DocumentStore:
         
         The content is vectorized via the embedding model, then immediately discarded.
         Only the vector and metadata (title, url, summary) are stored.
-        
+
+        Threading: embedding runs in Python (torch/ONNX release the GIL
+        internally during the forward) and the insert itself detaches the
+        GIL on the Rust side, so concurrent add() calls from the pool
+        overlap their compute instead of queueing on the interpreter.
+
         Args:
             doc_id: Unique identifier for the document
             content: Document content (will be vectorized then discarded)
@@ -91,26 +370,44 @@ class DocumentStore:
         Example:
             >>> store.add("doc1", "Long content...", title="My Doc", summary="Brief summary")
         """
-        def embedding_callback(text: str) -> List[float]:
-            """Callback for Rust to get embedding."""
-            embedding = self.embedder.encode(text)
-            # Ensure flat list
-            if isinstance(embedding, list) and len(embedding) > 0 and isinstance(embedding[0], list):
-                embedding = embedding[0]
-            return embedding
-        
-        # Call Rust with callback
-        with self._lock:
-            self._store.set(doc_id, content, title, url, summary, embedding_callback)
+        if self._query_cache is not None:
+            self._query_cache_clear()
+
+        # Near-duplicate reuse: a typo-level edit of previously added
+        # content keeps that content's embedding instead of a forward pass
+        if self._lsh is not None:
+            mh = self._minhash(content)
+            vector = self._near_duplicate_vector(mh)
+            if vector is None:
+                vector = self._encode_cached(content)
+                self._remember_signature(mh, vector)
+            self._set_vector(doc_id, vector, title, url, summary)
+            return
+
+        # Embed here (content-hash cache first), then hand Rust only the
+        # float32 vector via the buffer protocol. The old callback-based
+        # set() bounced Python->Rust->Python->Rust per insert; the content
+        # string never needed to cross the boundary at all.
+        vector = self._encode_cached(content)
+        self._set_vector(doc_id, vector, title, url, summary)
     
     def add_batch(
         self,
         documents: List[Dict[str, str]],
-        parallel: bool = True
+        parallel: bool = True,
+        embed_batch_size: Optional[int] = None
     ) -> None:
         """
-        Add multiple documents in parallel (Create operation).
-        
+        Add multiple documents with batched vectorization (Create operation).
+
+        Contents are embedded in large batched forward passes through the
+        model (see TextEmbedder.embed_batch), which amortizes tokenizer
+        setup and kernel launch overhead over the whole batch. This is
+        typically 5-20x faster than embedding each document individually.
+        Documents are processed in slices of embed_batch_size and inserted
+        as each slice completes, so peak memory stays bounded regardless of
+        how many documents are passed.
+
         Args:
             documents: List of document dictionaries with keys:
                       - id: Document ID (required)
@@ -118,8 +415,12 @@ class DocumentStore:
                       - title: Document title (optional)
                       - url: Document URL (optional)
                       - summary: Document summary (optional)
-            parallel: Use parallel processing (default: True)
-        
+            parallel: Kept for backward compatibility; embedding is always
+                      batched now, which outperforms the old thread pool
+            embed_batch_size: Documents per embed slice. Defaults to 128 on
+                              GPU (big batches keep the device saturated)
+                              and 32 on CPU
+
         Example:
             >>> docs = [
             ...     {"id": "1", "content": "...", "title": "...", "summary": "..."},
@@ -127,45 +428,73 @@ class DocumentStore:
             ... ]
             >>> store.add_batch(docs)
         """
-        if parallel:
-            # Parallel processing with thread pool
-            futures = []
-            for doc in documents:
-                doc_id = doc.get('id')
-                content = doc.get('content')
-                
-                if not doc_id or not content:
-                    raise ValueError(f"Document missing required fields 'id' and/or 'content': {doc}")
-                
-                future = self._executor.submit(
-                    self.add,
-                    doc_id,
-                    content,
-                    doc.get('title', ''),
-                    doc.get('url', ''),
-                    doc.get('summary', '')
-                )
-                futures.append(future)
-            
-            # Wait for all to complete
-            for future in as_completed(futures):
-                future.result()  # Raise any exceptions
-        else:
-            # Sequential processing
-            for doc in documents:
-                doc_id = doc.get('id')
-                content = doc.get('content')
-                
-                if not doc_id or not content:
-                    raise ValueError(f"Document missing required fields 'id' and/or 'content': {doc}")
-                
-                self.add(
-                    doc_id,
-                    content,
-                    doc.get('title', ''),
-                    doc.get('url', ''),
-                    doc.get('summary', '')
-                )
+        # Validate upfront and collect contents for batched embed calls
+        contents = []
+        for doc in documents:
+            doc_id = doc.get('id')
+            content = doc.get('content')
+
+            if not doc_id or not content:
+                raise ValueError(f"Missing required field 'id' and/or 'content' in document: {doc}")
+
+            contents.append(content)
+
+        if self._query_cache is not None:
+            self._query_cache_clear()
+
+        if embed_batch_size is None:
+            embed_batch_size = 128 if getattr(self.embedder, 'device', 'cpu') == "cuda" else 32
+
+        # Single slice: embed and insert inline, no pipeline bookkeeping
+        if len(documents) <= embed_batch_size:
+            self._insert_slice(documents, self.embedder.embed_batch(contents))
+            return
+
+        # Two-stage pipeline: this thread embeds slice N+1 while a writer
+        # thread pushes slice N into the Rust store. The bounded queue caps
+        # in-flight vectors at two slices; embedding dominates, so the
+        # writer is essentially free overlap rather than a fan-out of
+        # per-document model calls competing for the model.
+        work: queue.Queue = queue.Queue(maxsize=2)
+        errors: List[Exception] = []
+
+        def writer():
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                doc_slice, vectors = item
+                if not errors:
+                    try:
+                        self._insert_slice(doc_slice, vectors)
+                    except Exception as e:  # propagate after drain
+                        errors.append(e)
+
+        thread = threading.Thread(target=writer, daemon=True)
+        thread.start()
+        try:
+            for start in range(0, len(documents), embed_batch_size):
+                doc_slice = documents[start:start + embed_batch_size]
+                vectors = self.embedder.embed_batch(contents[start:start + embed_batch_size])
+                work.put((doc_slice, vectors))
+        finally:
+            work.put(None)
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def _insert_slice(self, doc_slice: List[Dict[str, str]], vectors) -> None:
+        """Insert one embedded slice with a single batched FFI call."""
+        # One boundary crossing and one Rust write-lock acquisition for the
+        # whole slice; the (n, dim) matrix is borrowed via the buffer
+        # protocol rather than converted row by row
+        self._store.set_vector_many(
+            [doc['id'] for doc in doc_slice],
+            np.ascontiguousarray(vectors, dtype=np.float32),
+            [doc.get('title', '') for doc in doc_slice],
+            [doc.get('url', '') for doc in doc_slice],
+            [doc.get('summary', '') for doc in doc_slice],
+        )
     
     def get(self, doc_id: str) -> Optional[Dict[str, str]]:
         """
@@ -182,7 +511,7 @@ class DocumentStore:
             >>> metadata = store.get("doc1")
             >>> print(metadata['title'], metadata['summary'])
         """
-        return self._store.get(doc_id)
+        return self._get(doc_id)
     
     def update(
         self,
@@ -203,8 +532,12 @@ class DocumentStore:
         Example:
             >>> store.update("doc1", title="New Title", summary="Updated summary")
         """
-        with self._lock:
-            self._store.update(doc_id, title, url, summary)
+        # Nothing to change - skip the FFI call and lock acquisition
+        if title is None and url is None and summary is None:
+            return
+        if self._query_cache is not None:
+            self._query_cache_clear()
+        self._store.update(doc_id, title, url, summary)
     
     def delete(self, doc_id: str) -> None:
         """
@@ -216,23 +549,48 @@ class DocumentStore:
         Example:
             >>> store.delete("doc1")
         """
-        with self._lock:
-            self._store.rm(doc_id)
+        if self._query_cache is not None:
+            self._query_cache_clear()
+        self._rm(doc_id)
     
     def delete_batch(self, doc_ids: List[str]) -> None:
         """
         Delete multiple documents.
-        
+
+        The whole batch is handed to Rust in one call, which acquires the
+        store's write lock once for all removals instead of once per id.
+
         Args:
             doc_ids: List of document identifiers
-        
+
         Example:
             >>> store.delete_batch(["doc1", "doc2", "doc3"])
         """
-        with self._lock:
-            for doc_id in doc_ids:
-                self._store.rm(doc_id)
+        if self._query_cache is not None:
+            self._query_cache_clear()
+        self._store.rm_many(doc_ids)
     
+    def _search_core(self, query_or_vec, k: int):
+        """
+        Shared search path: embed text queries (cache-aware), then run the
+        columnar Rust search.
+
+        Returns the five parallel columns (ids, scores, titles, urls,
+        summaries) with scores as a float32 numpy array. The public search
+        methods are thin adapters over this, so result conversion exists in
+        exactly one shape per API instead of three re-implementations.
+        """
+        if isinstance(query_or_vec, str):
+            query_or_vec = self._encode_cached(query_or_vec)
+            if self._query_cache is not None:
+                columns = self._query_cache_get(query_or_vec, k)
+                if columns is not None:
+                    return columns
+                columns = self._search_columns(query_or_vec, k)
+                self._query_cache_put(query_or_vec, k, columns)
+                return columns
+        return self._search_columns(query_or_vec, k)
+
     def search(
         self,
         query: str,
@@ -272,34 +630,24 @@ class DocumentStore:
             >>> for r in results:
             ...     print(f"{r.title}: {r.score:.3f}")
         """
-        # Generate query embedding - memory efficient, vector discarded after search
-        query_embedding = self.embedder.encode(query)
-        
-        # Ensure flat list
-        if isinstance(query_embedding, list) and len(query_embedding) > 0 and isinstance(query_embedding[0], list):
-            query_embedding = query_embedding[0]
-        
-        # Search in vector database - results already sorted by score (descending)
-        raw_results = self._store.search(query_embedding, k)
-        
-        # Free embedding memory immediately
-        del query_embedding
-        
+        # Structure-of-arrays from Rust: five parallel columns (scores as a
+        # float32 numpy array) instead of one result object per hit, sorted
+        # by score descending
+        ids, scores, titles, urls, summaries = self._search_core(query, k)
+
         if return_objects:
-            # Convert to SearchResult objects for structured access
+            # Build the SDK's frozen SearchResult dataclass straight from
+            # the columns - no intermediate per-hit objects
             return [
-                SearchResult(
-                    id=r['id'],
-                    score=r['score'],
-                    title=r.get('title', ''),
-                    url=r.get('url', ''),
-                    summary=r.get('summary', '')
-                )
-                for r in raw_results
+                SearchResult(id=i, score=float(s), title=t, url=u, summary=m)
+                for i, s, t, u, m in zip(ids, scores, titles, urls, summaries)
             ]
         else:
             # Return as dictionaries (backward compatible)
-            return raw_results
+            return [
+                {'id': i, 'score': float(s), 'title': t, 'url': u, 'summary': m}
+                for i, s, t, u, m in zip(ids, scores, titles, urls, summaries)
+            ]
     
     def search_streaming(
         self,
@@ -308,10 +656,12 @@ class DocumentStore:
     ) -> Iterator[SearchResult]:
         """
         Streaming search for memory-efficient result iteration.
-        
+
         Text is vectorized, searched, and results are yielded one at a time.
-        This minimizes memory usage by not buffering all results.
-        
+        The Rust side returns a lazy iterator (search_iter) rather than a
+        built list, so each result dict is materialized only when consumed
+        and Python-side peak memory stays O(1) in k.
+
         Args:
             query: Query text
             k: Number of results to return
@@ -324,27 +674,23 @@ class DocumentStore:
             ...     print(f"{result.title}: {result.score:.3f}")
             ...     # Process result immediately, no buffering
         """
-        # Generate query embedding
-        query_embedding = self.embedder.encode(query)
-        
-        # Ensure flat list
-        if isinstance(query_embedding, list) and len(query_embedding) > 0 and isinstance(query_embedding[0], list):
-            query_embedding = query_embedding[0]
-        
-        # Search - results already sorted
-        raw_results = self._store.search(query_embedding, k)
-        
+        # Generate query embedding - cached, so repeated queries skip the model
+        query_embedding = self._encode_cached(query)
+
+        # Lazy Rust iterator - each next() builds exactly one result dict
+        result_iter = self._search_iter(query_embedding, k)
+
         # Free embedding memory
         del query_embedding
-        
+
         # Yield results one at a time for streaming
-        for r in raw_results:
+        for r in result_iter:
             yield SearchResult(
-                id=r['id'],
-                score=r['score'],
-                title=r.get('title', ''),
-                url=r.get('url', ''),
-                summary=r.get('summary', '')
+                id=r.id,
+                score=r.score,
+                title=r.title,
+                url=r.url,
+                summary=r.summary
             )
             # Each result is yielded and can be processed/freed immediately
     
@@ -359,16 +705,69 @@ class DocumentStore:
         Args:
             vector: Query vector
             k: Number of results to return
-        
+
         Returns:
-            List of result dictionaries
-        
+            List of result dictionaries sorted by relevance (keys: id,
+            score, title, url, summary) - same shape as search()
+
         Example:
             >>> vec = embedder.encode("some text")
             >>> results = store.search_by_vector(vec, k=5)
         """
-        return self._store.search(vector, k)
+        # Same columnar path as search(), minus the embed step
+        ids, scores, titles, urls, summaries = self._search_core(vector, k)
+        return [
+            {'id': i, 'score': float(s), 'title': t, 'url': u, 'summary': m}
+            for i, s, t, u, m in zip(ids, scores, titles, urls, summaries)
+        ]
     
+    @staticmethod
+    def rerank(
+        results: Union[List[Dict[str, Any]], List[SearchResult]],
+        scores,
+        k: int
+    ) -> Union[List[Dict[str, Any]], List[SearchResult]]:
+        """
+        Keep the k best results under externally computed scores.
+
+        For post-processing pipelines (MMR diversification, cross-encoder
+        rescoring) that assign new scores to a candidate list. Selection
+        uses argpartition - O(n) to pick the survivors, then a sort over
+        only k of them - instead of a full Python-level sorted() with
+        per-comparison attribute lookups.
+
+        Args:
+            results: Candidates from search() or search_by_vector(), as
+                     dicts or SearchResult objects
+            scores: New score per candidate (array-like, same length)
+            k: Number of results to keep
+
+        Returns:
+            The top-k candidates by the new scores, best first, in the
+            same shape as the input (dicts in, dicts out)
+
+        Example:
+            >>> results = store.search("query", k=100)
+            >>> new_scores = cross_encoder.score(query, results)
+            >>> best = DocumentStore.rerank(results, new_scores, k=10)
+        """
+        idx, kept = top_k(np.asarray(scores, dtype=np.float32), k)
+        if results and isinstance(results[0], dict):
+            return [
+                {**results[i], 'score': float(s)}
+                for i, s in zip(idx, kept)
+            ]
+        return [
+            SearchResult(
+                id=results[i].id,
+                score=float(s),
+                title=results[i].title,
+                url=results[i].url,
+                summary=results[i].summary,
+            )
+            for i, s in zip(idx, kept)
+        ]
+
     def count(self) -> int:
         """
         Get the number of documents in the store.
@@ -395,13 +794,37 @@ class DocumentStore:
         return self.count()
     
     def __contains__(self, doc_id: str) -> bool:
-        """Check if document exists."""
-        return self.get(doc_id) is not None
+        """Check if document exists (O(1) id-map probe, no dict build)."""
+        return self._store.contains(doc_id)
     
-    def __del__(self):
-        """Cleanup thread pool."""
-        if hasattr(self, '_executor'):
+    def close(self) -> None:
+        """
+        Release the thread pool and cache database.
+
+        Idempotent. Preferred over relying on garbage collection: __del__
+        ordering at interpreter shutdown is unreliable and can hang on the
+        executor, so the store is a context manager instead.
+
+        Example:
+            >>> with DocumentStore() as store:
+            ...     store.add("doc1", "content")
+        """
+        try:
             self._executor.shutdown(wait=True)
+        except AttributeError:
+            pass  # __init__ failed before the pool existed
+        try:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        except AttributeError:
+            pass
+
+    def __enter__(self) -> 'DocumentStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
 
 # Convenience alias
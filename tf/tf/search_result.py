@@ -9,14 +9,17 @@ from typing import Optional
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class SearchResult:
     """
     Immutable search result with minimal memory footprint.
-    
+
     Uses frozen dataclass with __slots__ to minimize memory overhead.
     Each result stores only metadata and relevance score, no vectors.
-    
+    Equality is identity (eq=False): results are never compared
+    field-by-field, so the generated __eq__/__hash__ over five fields
+    would be dead weight.
+
     Attributes:
         id: Document identifier
         score: Relevance score (0-1, higher is more relevant)
@@ -54,7 +57,7 @@ class SearchResult:
         return f"SearchResult(id='{self.id}', score={self.score:.4f}, title='{self.title[:30]}...')"
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class StreamingSearchResult:
     """
     Lightweight streaming search result for memory-efficient iteration.
@@ -22,33 +22,100 @@ class VectorStoreWrapper:
     KEY FEATURE: Content is NOT stored - only vectors and metadata!
     """
     
-    def __init__(self, embedder: TextEmbedder = None, rust_store=None):
+    def __init__(
+        self,
+        embedder: TextEmbedder = None,
+        rust_store=None,
+        quantize: str = 'f32',
+        persistable: bool = False
+    ):
         """
         Initialize the vector store wrapper.
-        
+
         Args:
             embedder: TextEmbedder instance (created if None)
             rust_store: Rust VectorStore instance (created if None)
+            quantize: Vector storage precision: 'f32' (default, HNSW index)
+                      or 'int8' (flat scan over int8 codes, ~4x less memory
+                      and scan bandwidth at a small accuracy cost)
+            persistable: Back the store with an exact flat scan instead of
+                         the HNSW graph so it can be written with save()
+                         and reopened with open(). Only the flat f32 layout
+                         has an on-disk format, so this requires
+                         quantize='f32'. Trade-off: exact O(N) scans
+                         instead of the graph's O(log N) search
         """
         # Initialize embedder
         if embedder is None:
             self.embedder = TextEmbedder()
         else:
             self.embedder = embedder
-        
+
         # Initialize Rust store
         if rust_store is None:
             try:
                 from tf_rust import VectorStore
-                self.store = VectorStore(self.embedder.get_dimension())
             except ImportError as e:
                 raise ImportError(
                     "Failed to import tf_rust module. "
                     "Please build the Rust extension first using 'maturin develop' or 'maturin build'."
                 ) from e
+            if quantize == 'f32':
+                if persistable:
+                    self.store = VectorStore.new_flat(self.embedder.get_dimension())
+                else:
+                    self.store = VectorStore(self.embedder.get_dimension())
+            elif quantize == 'int8':
+                if persistable:
+                    raise ValueError(
+                        "persistable=True requires quantize='f32' - only the "
+                        "flat f32 layout has an on-disk format"
+                    )
+                self.store = VectorStore.new_flat_i8(self.embedder.get_dimension())
+            else:
+                raise ValueError(f"Unknown quantize mode: {quantize!r} (expected 'f32' or 'int8')")
         else:
             self.store = rust_store
     
+    @classmethod
+    def open(cls, path: str, embedder: TextEmbedder = None) -> 'VectorStoreWrapper':
+        """
+        Open a previously saved store read-only via mmap.
+
+        Vectors are read straight from the OS page cache (no heap copy and
+        no re-embedding), so cold start is instant regardless of store size,
+        and multiple processes opening the same file share the memory.
+        The returned store supports search but rejects inserts.
+
+        Args:
+            path: Store file previously written by save()
+            embedder: TextEmbedder instance (created if None)
+
+        Returns:
+            VectorStoreWrapper backed by the mapped file
+        """
+        try:
+            from tf_rust import VectorStore
+        except ImportError as e:
+            raise ImportError(
+                "Failed to import tf_rust module. "
+                "Please build the Rust extension first using 'maturin develop' or 'maturin build'."
+            ) from e
+        return cls(embedder=embedder, rust_store=VectorStore.open_mmap(path))
+
+    def save(self, path: str) -> None:
+        """
+        Persist the store to disk.
+
+        Only flat f32 stores have an on-disk format - construct the
+        wrapper with persistable=True to get one. The file can be reopened
+        instantly with open() - no re-embedding.
+
+        Args:
+            path: Destination file path
+        """
+        self.store.save(path)
+
     def add_document(
         self,
         doc_id: str,
@@ -70,21 +137,12 @@ class VectorStoreWrapper:
             url: Document URL (optional, will be stored)
             summary: Document summary (optional, will be stored)
         """
-        # Create callback function for Rust to call
-        def embedding_callback(text: str) -> List[float]:
-            """Callback that Rust calls to get the embedding vector."""
-            embedding = self.embedder.encode(text)
-            # Ensure embedding is a flat list of floats
-            if isinstance(embedding, list) and len(embedding) > 0 and isinstance(embedding[0], list):
-                embedding = embedding[0]
-            return embedding
-        
-        # Call Rust's set method with the callback
-        # Rust will:
-        # 1. Call embedding_callback(content) to get the vector
-        # 2. Store the vector with metadata (title, url, summary)
-        # 3. Discard the content - it's never stored!
-        self.store.set(doc_id, content, title, url, summary, embedding_callback)
+        # Embed in Python, then pass only the 1-D float32 vector to Rust
+        # via the buffer protocol. The content stays on this side of the
+        # FFI and is freed as soon as this frame returns - it's never
+        # stored.
+        vector = self.embedder.encode(content)
+        self.store.set_vector(doc_id, vector, title, url, summary if summary else None)
     
     def add_document_with_vector(
         self,
@@ -110,11 +168,14 @@ class VectorStoreWrapper:
     
     def add_documents(self, documents: List[Dict[str, str]]) -> None:
         """
-        Add multiple documents at once.
-        
-        MEMORY EFFICIENT: Each document's content is vectorized and discarded
-        before processing the next one.
-        
+        Add multiple documents at once with batched vectorization.
+
+        All contents go through ONE tokenizer call and ONE model forward
+        (TextEmbedder.embed_batch) instead of a per-document transformer
+        call, typically 5-20x faster ingestion. Contents are still discarded
+        as soon as the batch is vectorized - only vectors and metadata are
+        stored.
+
         Args:
             documents: List of document dictionaries with keys:
                       - id: Document ID (required)
@@ -122,46 +183,54 @@ class VectorStoreWrapper:
                       - title: Document title (optional, will be stored)
                       - url: Document URL (optional, will be stored)
         """
+        # Validate upfront so a bad document fails before any model work
+        contents = []
         for doc in documents:
-            doc_id = doc.get('id')
-            content = doc.get('content')
-            
-            if not doc_id or not content:
+            if not doc.get('id') or not doc.get('content'):
                 raise ValueError("Each document must have 'id' and 'content' fields")
-            
-            title = doc.get('title', '')
-            url = doc.get('url', '')
-            summary = doc.get('summary', '')
-            
-            self.add_document(doc_id, content, title, url, summary)
-            # At this point, content has been vectorized and discarded!
+            contents.append(doc['content'])
+
+        # One tokenizer call + one forward pass for the whole batch
+        vectors = self.embedder.embed_batch(contents)
+        del contents
+
+        # numpy rows pass to Rust zero-copy via the buffer protocol
+        for doc, vector in zip(documents, vectors):
+            self.store.set_vector(
+                doc['id'],
+                vector,
+                doc.get('title', ''),
+                doc.get('url', ''),
+                doc.get('summary', '') or None
+            )
     
     def search(
         self,
         query: str,
-        k: int = 5
+        k: int = 5,
+        nprobe: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for documents similar to the query text.
-        
+
         Args:
             query: Query text
             k: Number of results to return
-            
+            nprobe: Number of inverted lists to probe (IVF-PQ stores only;
+                    ignored by the default HNSW index)
+
         Returns:
-            List of result dictionaries with keys: id, score, title, url, summary
+            List of SearchResult objects built in Rust with attributes:
+            id, score, title, url, summary (call .to_dict() for a plain dict)
             Note: 'content' is NOT included since we don't store it!
         """
-        # Generate embedding for query
-        query_embedding = self.embedder.encode(query)
-        
-        # Ensure embedding is a flat list of floats
-        if isinstance(query_embedding, list) and len(query_embedding) > 0 and isinstance(query_embedding[0], list):
-            query_embedding = query_embedding[0]
-        
+        # Flat (D,) float32 by contract - no shape introspection needed,
+        # and the array crosses into Rust via the buffer protocol
+        query_embedding = self.embedder.encode_one(query)
+
         # Search in Rust store
-        results = self.store.search(query_embedding, k)
-        
+        results = self.store.search(query_embedding, k, nprobe)
+
         return results
     
     def search_by_embedding(
@@ -175,12 +244,24 @@ class VectorStoreWrapper:
         Args:
             embedding: Query embedding (list of floats)
             k: Number of results to return
-            
+
         Returns:
-            List of result dictionaries with keys: id, score, title, url
+            List of SearchResult objects with attributes: id, score, title, url
         """
         return self.store.search(embedding, k)
     
+    def set_ef(self, ef: int) -> None:
+        """
+        Set the HNSW search beam width (ef_search).
+
+        Larger values explore more of the graph per query, trading search
+        speed for recall. Must be at least as large as k.
+
+        Args:
+            ef: Beam width (default: 50)
+        """
+        self.store.set_ef(ef)
+
     def remove_document(self, doc_id: str) -> None:
         """
         Remove a document from the store.